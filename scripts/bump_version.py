@@ -5,6 +5,9 @@ import argparse
 import re
 from pathlib import Path
 
+PYPROJECT_VERSION_RE = re.compile(r'^version\s*=\s*"[^"]+"', re.MULTILINE)
+INIT_VERSION_RE = re.compile(r'^__version__\s*=\s*"[^"]+"', re.MULTILINE)
+
 
 def strip_version(value: str) -> str:
     version = value.strip()
@@ -15,9 +18,9 @@ def strip_version(value: str) -> str:
     return version
 
 
-def update_file(path: Path, pattern: str, replacement: str) -> None:
+def update_file(path: Path, pattern: re.Pattern[str], replacement: str) -> None:
     text = path.read_text(encoding="utf-8")
-    new_text, count = re.subn(pattern, replacement, text, count=1, flags=re.MULTILINE)
+    new_text, count = pattern.subn(replacement, text, count=1)
     if count != 1:
         raise SystemExit(f"Failed to update version in {path}")
     path.write_text(new_text, encoding="utf-8")
@@ -31,10 +34,10 @@ def main() -> None:
     version = strip_version(args.version)
 
     pyproject = Path("pyproject.toml")
-    update_file(pyproject, r'^version\s*=\s*"[^"]+"', f'version = "{version}"')
+    update_file(pyproject, PYPROJECT_VERSION_RE, f'version = "{version}"')
 
     init_path = Path("src/trailgen/__init__.py")
-    update_file(init_path, r'^__version__\s*=\s*"[^"]+"', f'__version__ = "{version}"')
+    update_file(init_path, INIT_VERSION_RE, f'__version__ = "{version}"')
 
     print(f"Bumped version to {version}")
 
@@ -1,5 +1,9 @@
 from .auto import AutoCameraConfig, FreeCameraFrame, build_auto_camera_frames
-from .follow import FollowCameraConfig, build_follow_camera_frames
+from .follow import (
+    FollowCameraConfig,
+    build_follow_camera_frames,
+    iter_follow_camera_frames,
+)
 
 __all__ = [
     "AutoCameraConfig",
@@ -7,4 +11,5 @@ __all__ = [
     "build_auto_camera_frames",
     "FollowCameraConfig",
     "build_follow_camera_frames",
+    "iter_follow_camera_frames",
 ]
@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import bisect
 import math
+from collections import deque
 from dataclasses import dataclass
 
 from trailgen.geo import (
     EARTH_RADIUS_M,
     RoutePoint,
-    bearing_deg,
+    bearings_deg,
     haversine_m,
     interpolate_along_route,
+    interpolate_columns,
+    route_columns,
 )
 from trailgen.terrain import TerrainSampler
 
+_LOS_STEP_M = 40.0
+_LOS_MARGIN_M = 2.0
+
 
 @dataclass(frozen=True)
 class FreeCameraFrame:
@@ -47,11 +53,17 @@ class AutoCandidate:
 
 
 @dataclass(frozen=True)
-class _RouteSample:
-    distance_m: float
-    point: RoutePoint
-    bearing: float
-    progress: float
+class _RouteSamples:
+    # One entry per main frame, kept as parallel columns so the per-frame
+    # passes index plain lists instead of building an object per sample.
+    distances: list[float]
+    lats: list[float]
+    lons: list[float]
+    eles: list[float]
+    bearings: list[float]
+    heading_easts: list[float]
+    heading_norths: list[float]
+    progresses: list[float]
 
 
 def _offset_latlon(
@@ -72,48 +84,82 @@ def _meters_offset(
     return east, north
 
 
+def _make_local_frame(ref_lat: float) -> tuple[float, float]:
+    m_per_deg_lat = EARTH_RADIUS_M * math.pi / 180.0
+    m_per_deg_lon = m_per_deg_lat * math.cos(math.radians(ref_lat))
+    return m_per_deg_lat, m_per_deg_lon
+
+
+def _prefetch_route_tiles(
+    terrain: TerrainSampler, lats: list[float], lons: list[float], margin_m: float
+) -> None:
+    south, west = _offset_latlon(min(lats), min(lons), -margin_m, -margin_m)
+    north, east = _offset_latlon(max(lats), max(lons), margin_m, margin_m)
+    terrain.prefetch(west, south, east, north)
+
+
 def _weighted_distances(
     distances: list[float],
     summit_distance: float,
     summit_sigma_m: float,
     summit_bonus: float,
 ) -> list[float]:
+    two_sigma_sq = 2 * summit_sigma_m**2
     weighted = [0.0]
     for idx in range(1, len(distances)):
         mid = 0.5 * (distances[idx - 1] + distances[idx])
         weight = 1.0 + summit_bonus * math.exp(
-            -((mid - summit_distance) ** 2) / (2 * summit_sigma_m**2)
+            -((mid - summit_distance) ** 2) / two_sigma_sq
         )
         segment = distances[idx] - distances[idx - 1]
         weighted.append(weighted[-1] + segment * weight)
     return weighted
 
 
-def _distance_for_time(
-    distances: list[float], weighted: list[float], t: float
-) -> float:
-    if t <= 0:
-        return distances[0]
-    if t >= 1:
-        return distances[-1]
-    target = t * weighted[-1]
-    idx = bisect.bisect_left(weighted, target)
-    if idx <= 0:
-        return distances[0]
-    if idx >= len(weighted):
-        return distances[-1]
-    w0 = weighted[idx - 1]
-    w1 = weighted[idx]
-    if w1 == w0:
-        return distances[idx]
-    ratio = (target - w0) / (w1 - w0)
-    return distances[idx - 1] + ratio * (distances[idx] - distances[idx - 1])
+def _distances_for_times(
+    distances: list[float], weighted: list[float], ts: list[float]
+) -> list[float]:
+    result: list[float] = []
+    lo = 0
+    for t in ts:
+        if t <= 0:
+            result.append(distances[0])
+            continue
+        if t >= 1:
+            result.append(distances[-1])
+            continue
+        target = t * weighted[-1]
+        # Times arrive in order, so resume the search where the last one ended.
+        if lo > 0 and weighted[lo - 1] >= target:
+            lo = 0
+        idx = bisect.bisect_left(weighted, target, lo)
+        lo = idx
+        if idx <= 0:
+            result.append(distances[0])
+            continue
+        if idx >= len(weighted):
+            result.append(distances[-1])
+            continue
+        w0 = weighted[idx - 1]
+        w1 = weighted[idx]
+        if w1 == w0:
+            result.append(distances[idx])
+            continue
+        ratio = (target - w0) / (w1 - w0)
+        result.append(
+            distances[idx - 1] + ratio * (distances[idx] - distances[idx - 1])
+        )
+    return result
 
 
 def _compute_relief(
     distances: list[float], elevations: list[float], window_m: float
 ) -> list[float]:
+    # Sliding-window max - min using monotonic deques of indices: each index
+    # enters and leaves each deque once, so the whole pass is O(N).
     relief = [0.0] * len(distances)
+    highs: deque[int] = deque()
+    lows: deque[int] = deque()
     start = 0
     end = 0
     for idx in range(len(distances)):
@@ -121,27 +167,93 @@ def _compute_relief(
         while start < len(distances) and distances[start] < center - window_m / 2:
             start += 1
         while end < len(distances) and distances[end] <= center + window_m / 2:
+            ele = elevations[end]
+            while highs and elevations[highs[-1]] <= ele:
+                highs.pop()
+            highs.append(end)
+            while lows and elevations[lows[-1]] >= ele:
+                lows.pop()
+            lows.append(end)
             end += 1
-        window = elevations[start:end]
-        if window:
-            relief[idx] = max(window) - min(window)
+        while highs and highs[0] < start:
+            highs.popleft()
+        while lows and lows[0] < start:
+            lows.popleft()
+        if highs:
+            relief[idx] = elevations[highs[0]] - elevations[lows[0]]
     return relief
 
 
-def _interpolate_scalar(
-    distances: list[float], values: list[float], target: float
-) -> float:
-    if target <= distances[0]:
-        return values[0]
-    if target >= distances[-1]:
-        return values[-1]
-    idx = bisect.bisect_left(distances, target)
-    prev_d = distances[idx - 1]
-    next_d = distances[idx]
-    if next_d == prev_d:
-        return values[idx]
-    ratio = (target - prev_d) / (next_d - prev_d)
-    return values[idx - 1] + ratio * (values[idx] - values[idx - 1])
+def _interpolate_scalars(
+    distances: list[float], values: list[float], targets: list[float]
+) -> list[float]:
+    result: list[float] = []
+    lo = 1
+    for target in targets:
+        if target <= distances[0]:
+            result.append(values[0])
+            continue
+        if target >= distances[-1]:
+            result.append(values[-1])
+            continue
+        if distances[lo - 1] >= target:
+            lo = 1
+        idx = bisect.bisect_left(distances, target, lo)
+        lo = idx
+        prev_d = distances[idx - 1]
+        next_d = distances[idx]
+        if next_d == prev_d:
+            result.append(values[idx])
+            continue
+        ratio = (target - prev_d) / (next_d - prev_d)
+        result.append(values[idx - 1] + ratio * (values[idx] - values[idx - 1]))
+    return result
+
+
+def _sample_profiles(
+    samples: _RouteSamples,
+    distances: list[float],
+    relief: list[float],
+    summit_distance: float,
+    summit_sigma_m: float,
+) -> tuple[list[float], list[float]]:
+    two_sigma_sq = 2 * summit_sigma_m**2
+    sample_reliefs = _interpolate_scalars(distances, relief, samples.distances)
+    summit_weights = [
+        math.exp(-((sample_m - summit_distance) ** 2) / two_sigma_sq)
+        for sample_m in samples.distances
+    ]
+    return sample_reliefs, summit_weights
+
+
+def _ray_samples(
+    camera: RoutePoint, target: RoutePoint, step_m: float
+) -> tuple[list[float], list[float], list[float]]:
+    distance = haversine_m(camera, target)
+    steps = max(1, int(distance / step_m))
+    lat0, lon0 = camera.lat, camera.lon
+    dlat = target.lat - lat0
+    dlon = target.lon - lon0
+    ts = [idx / steps for idx in range(1, steps)]
+    lats = [lat0 + dlat * t for t in ts]
+    lons = [lon0 + dlon * t for t in ts]
+    return ts, lats, lons
+
+
+def _ray_clear(
+    ts: list[float],
+    heights: list[float | None],
+    camera_alt: float,
+    target_alt: float,
+    margin_m: float,
+) -> bool:
+    rise = target_alt - camera_alt
+    for t, terrain_alt in zip(ts, heights):
+        if terrain_alt is None:
+            continue
+        if terrain_alt + margin_m > camera_alt + rise * t:
+            return False
+    return True
 
 
 def _line_of_sight_visible(
@@ -150,26 +262,29 @@ def _line_of_sight_visible(
     camera_alt: float,
     target: RoutePoint,
     target_alt: float,
-    step_m: float = 40.0,
-    margin_m: float = 2.0,
+    step_m: float = _LOS_STEP_M,
+    margin_m: float = _LOS_MARGIN_M,
 ) -> bool:
-    distance = haversine_m(camera, target)
-    steps = max(1, int(distance / step_m))
-    for idx in range(1, steps):
-        t = idx / steps
-        lat = camera.lat + (target.lat - camera.lat) * t
-        lon = camera.lon + (target.lon - camera.lon) * t
-        ray_alt = camera_alt + (target_alt - camera_alt) * t
-        terrain_alt = terrain.height_at(lon, lat)
-        if terrain_alt is None:
-            continue
-        if terrain_alt + margin_m > ray_alt:
+    ts, lats, lons = _ray_samples(camera, target, step_m)
+    # Blocked rays are usually blocked over a long stretch, so a coarse pass
+    # rejects most of them before the in-between samples are looked up.
+    stride = max(1, min(8, len(ts) // 4))
+    if stride > 1:
+        coarse = terrain.height_at_many(lons[::stride], lats[::stride])
+        if not _ray_clear(ts[::stride], coarse, camera_alt, target_alt, margin_m):
             return False
-    return True
+        rest = [idx for idx in range(len(ts)) if idx % stride]
+        ts = [ts[idx] for idx in rest]
+        lats = [lats[idx] for idx in rest]
+        lons = [lons[idx] for idx in rest]
+    heights = terrain.height_at_many(lons, lats)
+    return _ray_clear(ts, heights, camera_alt, target_alt, margin_m)
 
 
 def _build_samples(
-    route_points: list[RoutePoint],
+    route_lats: list[float],
+    route_lons: list[float],
+    route_eles: list[float],
     distances: list[float],
     total_distance: float,
     frames: int,
@@ -177,93 +292,135 @@ def _build_samples(
     summit_distance: float,
     summit_sigma_m: float,
     summit_bonus: float,
-) -> list[_RouteSample]:
+) -> _RouteSamples:
     weighted = _weighted_distances(
         distances, summit_distance, summit_sigma_m, summit_bonus
     )
-    samples: list[_RouteSample] = []
-    for frame in range(frames):
-        t = frame / (frames - 1) if frames > 1 else 0.0
-        target_m = _distance_for_time(distances, weighted, t)
-        next_target = min(total_distance, target_m + lookahead_m)
-        curr = interpolate_along_route(route_points, distances, target_m)
-        nxt = interpolate_along_route(route_points, distances, next_target)
-        bearing = bearing_deg(curr, nxt)
-        samples.append(
-            _RouteSample(
-                distance_m=target_m,
-                point=curr,
-                bearing=bearing,
-                progress=target_m / total_distance,
-            )
-        )
-    return samples
+    target_ms = _distances_for_times(
+        distances,
+        weighted,
+        [frame / (frames - 1) if frames > 1 else 0.0 for frame in range(frames)],
+    )
+    next_ms = [min(total_distance, target_m + lookahead_m) for target_m in target_ms]
+    lats, lons, eles = interpolate_columns(
+        route_lats, route_lons, route_eles, distances, target_ms
+    )
+    next_lats, next_lons, _ = interpolate_columns(
+        route_lats, route_lons, route_eles, distances, next_ms
+    )
+
+    # Frames dwelling on the summit or clamped to the route end repeat the
+    # exact same pair, so the bearing and its sin/cos are only computed once
+    # per run of identical pairs.
+    from_lats: list[float] = []
+    from_lons: list[float] = []
+    to_lats: list[float] = []
+    to_lons: list[float] = []
+    runs: list[int] = []
+    prev_pair = None
+    for pair in zip(lats, lons, next_lats, next_lons):
+        if pair != prev_pair:
+            from_lats.append(pair[0])
+            from_lons.append(pair[1])
+            to_lats.append(pair[2])
+            to_lons.append(pair[3])
+            prev_pair = pair
+        runs.append(len(from_lats) - 1)
+    run_bearings = bearings_deg(from_lats, from_lons, to_lats, to_lons)
+    run_headings = [_heading_components(bearing) for bearing in run_bearings]
+    bearings = [run_bearings[run] for run in runs]
+    heading_easts = [run_headings[run][0] for run in runs]
+    heading_norths = [run_headings[run][1] for run in runs]
+    return _RouteSamples(
+        distances=target_ms,
+        lats=lats,
+        lons=lons,
+        eles=eles,
+        bearings=bearings,
+        heading_easts=heading_easts,
+        heading_norths=heading_norths,
+        progresses=[target_m / total_distance for target_m in target_ms],
+    )
 
 
 def _build_camera_frames(
-    route_points: list[RoutePoint],
-    samples: list[_RouteSample],
+    route_lats: list[float],
+    route_lons: list[float],
+    route_eles: list[float],
+    samples: _RouteSamples,
     distances: list[float],
-    relief: list[float],
+    sample_reliefs: list[float],
+    summit_weights: list[float],
     total_distance: float,
     candidate: AutoCandidate,
     lookahead_m: float,
     terrain: TerrainSampler,
-    summit_distance: float,
-    summit_sigma_m: float,
+    summit_point: RoutePoint,
+    summit_alt: float,
+    summit_idx: int,
     summit_boost_m: float,
     relief_factor: float,
 ) -> list[FreeCameraFrame]:
-    frames: list[FreeCameraFrame] = []
-    min_altitudes: list[float] = []
-    turn_weights: list[float] = []
-    summit_idx = _summit_frame_index(samples, summit_distance)
-    summit_point = interpolate_along_route(route_points, distances, summit_distance)
-    summit_alt = (
-        terrain.height_at(summit_point.lon, summit_point.lat) or summit_point.ele
-    )
-    for idx, sample in enumerate(samples):
-        heading_rad = math.radians(sample.bearing)
-        heading_east = math.sin(heading_rad)
-        heading_north = math.cos(heading_rad)
+    # Everything up to the camera's ground position is plain arithmetic over
+    # the samples, so compute it column by column and batch the DEM lookups.
+    bearings = samples.bearings
+    sample_ms = samples.distances
+    count = len(sample_ms)
+    turn_weights = [0.0] * count
+    for idx in range(1, count - 1):
+        delta = abs(((bearings[idx + 1] - bearings[idx - 1] + 180) % 360) - 180)
+        turn_weights[idx] = min(1.0, delta / 60.0)
+
+    cam_lats = [0.0] * count
+    cam_lons = [0.0] * count
+    for idx in range(count):
+        heading_east = samples.heading_easts[idx]
+        heading_north = samples.heading_norths[idx]
         side_east = -heading_north
         side_north = heading_east
-        relief_here = _interpolate_scalar(distances, relief, sample.distance_m)
-        turn_weight = 0.0
-        if 0 < idx < len(samples) - 1:
-            prev_bearing = samples[idx - 1].bearing
-            next_bearing = samples[idx + 1].bearing
-            delta = abs(((next_bearing - prev_bearing + 180) % 360) - 180)
-            turn_weight = min(1.0, delta / 60.0)
-        relief_scale = 1.0 - min(0.45, relief_here / 1800.0)
-        summit_weight = math.exp(
-            -((sample.distance_m - summit_distance) ** 2) / (2 * summit_sigma_m**2)
-        )
+        summit_weight = summit_weights[idx]
+        relief_scale = 1.0 - min(0.45, sample_reliefs[idx] / 1800.0)
         summit_scale = 1.0 - 0.4 * summit_weight
         side_offset = candidate.side_offset_m * relief_scale * summit_scale
         back_offset = candidate.back_offset_m * (1.0 - 0.25 * summit_weight)
 
         east_m = side_east * side_offset + heading_east * (-back_offset)
         north_m = side_north * side_offset + heading_north * (-back_offset)
-        cam_lat, cam_lon = _offset_latlon(
-            sample.point.lat, sample.point.lon, east_m, north_m
+        cam_lats[idx], cam_lons[idx] = _offset_latlon(
+            samples.lats[idx], samples.lons[idx], east_m, north_m
         )
-        cam_ground = terrain.height_at(cam_lon, cam_lat)
+    cam_grounds = terrain.height_at_many(cam_lons, cam_lats)
+    target_ms = [
+        min(
+            total_distance,
+            sample_m + lookahead_m * (1.0 - 0.8 * summit_weight + 0.8 * turn_weight),
+        )
+        for sample_m, summit_weight, turn_weight in zip(
+            sample_ms, summit_weights, turn_weights
+        )
+    ]
+    target_lats, target_lons, target_eles = interpolate_columns(
+        route_lats, route_lons, route_eles, distances, target_ms
+    )
+    target_heights = terrain.height_at_many(target_lons, target_lats)
+
+    cam_alts = [0.0] * count
+    for idx in range(count):
+        cam_lat, cam_lon = cam_lats[idx], cam_lons[idx]
+        turn_weight = turn_weights[idx]
+        summit_weight = summit_weights[idx]
+        cam_ground = cam_grounds[idx]
         if cam_ground is None:
-            cam_ground = sample.point.ele
+            cam_ground = samples.eles[idx]
         clearance = (
             candidate.base_clearance_m
-            + relief_here * relief_factor
+            + sample_reliefs[idx] * relief_factor
             + summit_boost_m * summit_weight
         )
         cam_alt = cam_ground + clearance
 
-        dynamic_lookahead = lookahead_m * (
-            1.0 - 0.8 * summit_weight + 0.8 * turn_weight
-        )
-        target_m = min(total_distance, sample.distance_m + dynamic_lookahead)
-        target = interpolate_along_route(route_points, distances, target_m)
-        target_alt = terrain.height_at(target.lon, target.lat) or target.ele
+        target = RoutePoint(target_lats[idx], target_lons[idx], target_eles[idx])
+        target_alt = target_heights[idx] or target.ele
 
         cam_alt, _ = _ensure_visible_altitude(
             terrain,
@@ -290,70 +447,94 @@ def _build_camera_frames(
             )
         if turn_weight > 0:
             cam_alt += 80.0 * turn_weight
-        frames.append(
-            FreeCameraFrame(
-                position=[cam_lon, cam_lat],
-                altitude=cam_alt,
-                target=[target.lon, target.lat],
-                progress=sample.progress,
-            )
-        )
-        min_altitudes.append(cam_alt)
-        turn_weights.append(turn_weight)
-    return _smooth_camera_frames(frames, min_altitudes, turn_weights)
+        cam_alts[idx] = cam_alt
+
+    return _smooth_camera_frames(
+        cam_lons,
+        cam_lats,
+        cam_alts,
+        target_lons,
+        target_lats,
+        samples.progresses,
+        cam_alts,
+        turn_weights,
+    )
 
 
 def _smooth_camera_frames(
-    frames: list[FreeCameraFrame],
+    cam_lons: list[float],
+    cam_lats: list[float],
+    cam_alts: list[float],
+    target_lons: list[float],
+    target_lats: list[float],
+    progresses: list[float],
     min_altitudes: list[float],
     turn_weights: list[float],
 ) -> list[FreeCameraFrame]:
-    if not frames:
-        return frames
+    if not cam_lons:
+        return []
     base_pos_alpha = 0.18
     base_target_alpha = 0.14
     base_alt_alpha = 0.12
-    ref_lat = frames[0].position[1]
-    ref_lon = frames[0].position[0]
+    ref_lat = cam_lats[0]
+    ref_lon = cam_lons[0]
+    m_per_deg_lat, m_per_deg_lon = _make_local_frame(ref_lat)
     pos_e, pos_n = 0.0, 0.0
-    tar_e, tar_n = _meters_offset(
-        ref_lat, ref_lon, frames[0].target[1], frames[0].target[0]
-    )
-    alt = frames[0].altitude
-    smoothed: list[FreeCameraFrame] = []
-    for idx, frame in enumerate(frames):
-        turn_weight = turn_weights[idx] if idx < len(turn_weights) else 0.0
-        pos_alpha = max(0.05, base_pos_alpha * (1.0 - 0.6 * turn_weight))
-        target_alpha = max(0.04, base_target_alpha * (1.0 - 0.6 * turn_weight))
-        alt_alpha = max(0.05, base_alt_alpha * (1.0 - 0.4 * turn_weight))
-
-        cur_e, cur_n = _meters_offset(
-            ref_lat, ref_lon, frame.position[1], frame.position[0]
-        )
-        pos_e = pos_e * (1 - pos_alpha) + cur_e * pos_alpha
-        pos_n = pos_n * (1 - pos_alpha) + cur_n * pos_alpha
-
-        cur_te, cur_tn = _meters_offset(
-            ref_lat, ref_lon, frame.target[1], frame.target[0]
-        )
-        tar_e = tar_e * (1 - target_alpha) + cur_te * target_alpha
-        tar_n = tar_n * (1 - target_alpha) + cur_tn * target_alpha
-
-        alt = alt * (1 - alt_alpha) + frame.altitude * alt_alpha
-        if idx < len(min_altitudes) and alt < min_altitudes[idx]:
-            alt = min_altitudes[idx]
+    tar_e = (target_lons[0] - ref_lon) * m_per_deg_lon
+    tar_n = (target_lats[0] - ref_lat) * m_per_deg_lat
+    alt = cam_alts[0]
+
+    # Work on the raw per-frame columns so the recurrence below only touches
+    # local floats; frame objects are built once, from the smoothed values.
+    count = len(cam_lons)
+    weights = [
+        turn_weights[idx] if idx < len(turn_weights) else 0.0 for idx in range(count)
+    ]
+    pos_alphas = [max(0.05, base_pos_alpha * (1.0 - 0.6 * w)) for w in weights]
+    target_alphas = [max(0.04, base_target_alpha * (1.0 - 0.6 * w)) for w in weights]
+    alt_alphas = [max(0.05, base_alt_alpha * (1.0 - 0.4 * w)) for w in weights]
+    floors = [
+        min_altitudes[idx] if idx < len(min_altitudes) else -math.inf
+        for idx in range(count)
+    ]
+    pos_es = [(lon - ref_lon) * m_per_deg_lon for lon in cam_lons]
+    pos_ns = [(lat - ref_lat) * m_per_deg_lat for lat in cam_lats]
+    tar_es = [(lon - ref_lon) * m_per_deg_lon for lon in target_lons]
+    tar_ns = [(lat - ref_lat) * m_per_deg_lat for lat in target_lats]
+    alts = list(cam_alts)
 
-        pos_lat, pos_lon = _offset_latlon(ref_lat, ref_lon, pos_e, pos_n)
-        tar_lat, tar_lon = _offset_latlon(ref_lat, ref_lon, tar_e, tar_n)
-        smoothed.append(
-            FreeCameraFrame(
-                position=[pos_lon, pos_lat],
-                altitude=alt,
-                target=[tar_lon, tar_lat],
-                progress=frame.progress,
-            )
+    for idx in range(count):
+        pos_alpha = pos_alphas[idx]
+        target_alpha = target_alphas[idx]
+        alt_alpha = alt_alphas[idx]
+        pos_e = pos_e * (1 - pos_alpha) + pos_es[idx] * pos_alpha
+        pos_n = pos_n * (1 - pos_alpha) + pos_ns[idx] * pos_alpha
+        tar_e = tar_e * (1 - target_alpha) + tar_es[idx] * target_alpha
+        tar_n = tar_n * (1 - target_alpha) + tar_ns[idx] * target_alpha
+        alt = alt * (1 - alt_alpha) + alts[idx] * alt_alpha
+        if alt < floors[idx]:
+            alt = floors[idx]
+        pos_es[idx] = pos_e
+        pos_ns[idx] = pos_n
+        tar_es[idx] = tar_e
+        tar_ns[idx] = tar_n
+        alts[idx] = alt
+
+    return [
+        FreeCameraFrame(
+            position=[
+                ref_lon + pos_es[idx] / m_per_deg_lon,
+                ref_lat + pos_ns[idx] / m_per_deg_lat,
+            ],
+            altitude=alts[idx],
+            target=[
+                ref_lon + tar_es[idx] / m_per_deg_lon,
+                ref_lat + tar_ns[idx] / m_per_deg_lat,
+            ],
+            progress=progress,
         )
-    return smoothed
+        for idx, progress in enumerate(progresses)
+    ]
 
 
 def _ensure_visible_altitude(
@@ -367,71 +548,109 @@ def _ensure_visible_altitude(
     max_raise_m: float,
     step_m: float,
 ) -> tuple[float, bool]:
-    camera_point = RoutePoint(cam_lat, cam_lon, cam_ground)
-    if _line_of_sight_visible(terrain, camera_point, cam_alt, target, target_alt):
+    # Raising the camera only tilts the ray; the terrain under it is the same,
+    # so sample it once and solve for the altitude that clears every sample.
+    ts, lats, lons = _ray_samples(
+        RoutePoint(cam_lat, cam_lon, cam_ground), target, _LOS_STEP_M
+    )
+    heights = terrain.height_at_many(lons, lats)
+    if _ray_clear(ts, heights, cam_alt, target_alt, _LOS_MARGIN_M):
         return cam_alt, True
-    remaining = max(0.0, max_raise_m)
-    while remaining > 0:
-        cam_alt += step_m
-        if _line_of_sight_visible(terrain, camera_point, cam_alt, target, target_alt):
-            return cam_alt, True
-        remaining -= step_m
-    return cam_alt, False
-
-
-def _summit_frame_index(samples: list[_RouteSample], summit_distance: float) -> int:
-    best_idx = 0
-    best_delta = float("inf")
-    for idx, sample in enumerate(samples):
-        delta = abs(sample.distance_m - summit_distance)
-        if delta < best_delta:
-            best_delta = delta
-            best_idx = idx
-    return best_idx
+
+    # The ray clears a sample at fraction t when
+    # cam_alt * (1 - t) + target_alt * t >= height + margin.
+    required = max(
+        (height + _LOS_MARGIN_M - target_alt * t) / (1.0 - t)
+        for t, height in zip(ts, heights)
+        if height is not None
+    )
+    max_steps = math.ceil(max(0.0, max_raise_m) / step_m)
+    steps = max(1, math.ceil((required - cam_alt) / step_m))
+    while steps <= max_steps:
+        raised = cam_alt + steps * step_m
+        # Guard against rounding right at the boundary.
+        if _ray_clear(ts, heights, raised, target_alt, _LOS_MARGIN_M):
+            return raised, True
+        steps += 1
+    return cam_alt + max_steps * step_m, False
+
+
+def _summit_frame_index(samples: _RouteSamples, summit_distance: float) -> int:
+    sample_ms = samples.distances
+    return min(
+        range(len(sample_ms)),
+        key=lambda idx: abs(sample_ms[idx] - summit_distance),
+    )
 
 
 def _pick_best_candidate(
-    route_points: list[RoutePoint],
+    route_lats: list[float],
+    route_lons: list[float],
+    route_eles: list[float],
     candidates: list[AutoCandidate],
-    samples: list[_RouteSample],
+    samples: _RouteSamples,
     distances: list[float],
     total_distance: float,
-    relief: list[float],
+    sample_reliefs: list[float],
+    summit_weights: list[float],
     lookahead_m: float,
     terrain: TerrainSampler,
-    summit_distance: float,
-    summit_sigma_m: float,
+    summit_point: RoutePoint,
+    summit_alt: float,
+    summit_idx: int,
     summit_boost_m: float,
     relief_factor: float,
 ) -> AutoCandidate:
-    summit_idx = _summit_frame_index(samples, summit_distance)
+    count = len(samples.distances)
+    probes = list(range(0, count, max(1, count // 30)))
+    # Look-at targets depend only on the sample, not on the candidate.
+    probe_ms = []
+    for idx in probes:
+        sample_m = samples.distances[idx]
+        dynamic_lookahead = lookahead_m * (1.0 - 0.8 * summit_weights[idx])
+        probe_ms.append(min(total_distance, sample_m + dynamic_lookahead))
+    probe_lats, probe_lons, probe_eles = interpolate_columns(
+        route_lats, route_lons, route_eles, distances, probe_ms
+    )
+    probe_targets = [
+        RoutePoint(lat, lon, ele)
+        for lat, lon, ele in zip(probe_lats, probe_lons, probe_eles)
+    ]
+    probe_target_heights = terrain.height_at_many(probe_lons, probe_lats)
+
+    # Lay out every candidate's camera for every probe up front, so the
+    # ground heights for all candidates come from a single terrain batch.
+    positions = [
+        _camera_position(samples, idx, candidate)
+        for candidate in candidates
+        for idx in probes
+    ]
+    ground_heights = terrain.height_at_many(
+        [cam_lon for _, cam_lon in positions],
+        [cam_lat for cam_lat, _ in positions],
+    )
+
     best_score = -1.0
     best = candidates[0]
-    for candidate in candidates:
+    for slot, candidate in enumerate(candidates):
         visible = 0
         tested = 0
         avg_distance = 0.0
-        for idx in range(0, len(samples), max(1, len(samples) // 30)):
-            sample = samples[idx]
-            cam_lat, cam_lon = _camera_position(sample, candidate)
-            cam_ground = terrain.height_at(cam_lon, cam_lat) or sample.point.ele
-            relief_here = _interpolate_scalar(distances, relief, sample.distance_m)
-            summit_weight = math.exp(
-                -((sample.distance_m - summit_distance) ** 2) / (2 * summit_sigma_m**2)
-            )
+        start = slot * len(probes)
+        end = start + len(probes)
+        cam_positions = positions[start:end]
+        cam_heights = ground_heights[start:end]
+        for probe, idx in enumerate(probes):
+            target = probe_targets[probe]
+            cam_lat, cam_lon = cam_positions[probe]
+            cam_ground = cam_heights[probe] or samples.eles[idx]
             clearance = (
                 candidate.base_clearance_m
-                + relief_here * relief_factor
-                + summit_boost_m * summit_weight
+                + sample_reliefs[idx] * relief_factor
+                + summit_boost_m * summit_weights[idx]
             )
             cam_alt = cam_ground + clearance
-            summit_weight = math.exp(
-                -((sample.distance_m - summit_distance) ** 2) / (2 * summit_sigma_m**2)
-            )
-            dynamic_lookahead = lookahead_m * (1.0 - 0.8 * summit_weight)
-            target_m = min(total_distance, sample.distance_m + dynamic_lookahead)
-            target = interpolate_along_route(route_points, distances, target_m)
-            target_alt = terrain.height_at(target.lon, target.lat) or target.ele
+            target_alt = probe_target_heights[probe] or target.ele
             tested += 1
             if _line_of_sight_visible(
                 terrain,
@@ -441,9 +660,12 @@ def _pick_best_candidate(
                 target_alt,
             ):
                 visible += 1
-            avg_distance += haversine_m(
-                RoutePoint(cam_lat, cam_lon, 0.0),
-                RoutePoint(target.lat, target.lon, 0.0),
+            # Only compared against a ~650 m preference, so the flat-earth
+            # distance is plenty accurate here.
+            m_per_deg_lat, m_per_deg_lon = _make_local_frame(cam_lat)
+            avg_distance += math.hypot(
+                (target.lat - cam_lat) * m_per_deg_lat,
+                (target.lon - cam_lon) * m_per_deg_lon,
             )
 
         visibility = visible / max(1, tested)
@@ -451,16 +673,15 @@ def _pick_best_candidate(
         desired = 650.0
         distance_score = 1.0 - min(1.0, abs(avg_distance - desired) / desired)
 
-        summit_sample = samples[summit_idx]
         summit_visible = _is_summit_visible(
             terrain,
-            summit_sample,
+            samples,
+            summit_idx,
             candidate,
-            route_points,
-            distances,
-            relief,
-            summit_distance,
-            summit_sigma_m,
+            sample_reliefs[summit_idx],
+            summit_weights[summit_idx],
+            summit_point,
+            summit_alt,
             summit_boost_m,
             relief_factor,
         )
@@ -477,12 +698,18 @@ def _pick_best_candidate(
     return best
 
 
+def _heading_components(bearing: float) -> tuple[float, float]:
+    heading_rad = math.radians(bearing)
+    return math.sin(heading_rad), math.cos(heading_rad)
+
+
 def _camera_position(
-    sample: _RouteSample, candidate: AutoCandidate
+    samples: _RouteSamples,
+    idx: int,
+    candidate: AutoCandidate,
 ) -> tuple[float, float]:
-    heading_rad = math.radians(sample.bearing)
-    heading_east = math.sin(heading_rad)
-    heading_north = math.cos(heading_rad)
+    heading_east = samples.heading_easts[idx]
+    heading_north = samples.heading_norths[idx]
     side_east = -heading_north
     side_north = heading_east
     east_m = side_east * candidate.side_offset_m + heading_east * (
@@ -492,39 +719,31 @@ def _camera_position(
         -candidate.back_offset_m
     )
     cam_lat, cam_lon = _offset_latlon(
-        sample.point.lat, sample.point.lon, east_m, north_m
+        samples.lats[idx], samples.lons[idx], east_m, north_m
     )
     return cam_lat, cam_lon
 
 
 def _is_summit_visible(
     terrain: TerrainSampler,
-    sample: _RouteSample,
+    samples: _RouteSamples,
+    idx: int,
     candidate: AutoCandidate,
-    route_points: list[RoutePoint],
-    distances: list[float],
-    relief: list[float],
-    summit_distance: float,
-    summit_sigma_m: float,
+    relief_here: float,
+    summit_weight: float,
+    summit_point: RoutePoint,
+    summit_alt: float,
     summit_boost_m: float,
     relief_factor: float,
 ) -> bool:
-    cam_lat, cam_lon = _camera_position(sample, candidate)
-    cam_ground = terrain.height_at(cam_lon, cam_lat) or sample.point.ele
-    relief_here = _interpolate_scalar(distances, relief, sample.distance_m)
-    summit_weight = math.exp(
-        -((sample.distance_m - summit_distance) ** 2) / (2 * summit_sigma_m**2)
-    )
+    cam_lat, cam_lon = _camera_position(samples, idx, candidate)
+    cam_ground = terrain.height_at(cam_lon, cam_lat) or samples.eles[idx]
     clearance = (
         candidate.base_clearance_m
         + relief_here * relief_factor
         + summit_boost_m * summit_weight
     )
     cam_alt = cam_ground + clearance
-    summit_point = interpolate_along_route(route_points, distances, summit_distance)
-    summit_alt = (
-        terrain.height_at(summit_point.lon, summit_point.lat) or summit_point.ele
-    )
     return _line_of_sight_visible(
         terrain,
         RoutePoint(cam_lat, cam_lon, cam_ground),
@@ -544,8 +763,11 @@ def build_auto_camera_frames(
     elevations: list[float],
 ) -> list[FreeCameraFrame]:
     main_frames = max(2, cfg.total_frames - cfg.intro_frames - cfg.outro_frames)
+    route_lats, route_lons, route_eles = route_columns(route_points)
     samples = _build_samples(
-        route_points,
+        route_lats,
+        route_lons,
+        route_eles,
         distances,
         total_distance,
         main_frames,
@@ -555,6 +777,20 @@ def build_auto_camera_frames(
         summit_bonus=2.0,
     )
     relief = _compute_relief(distances, elevations, cfg.relief_window_m)
+    sample_reliefs, summit_weights = _sample_profiles(
+        samples, distances, relief, summit_distance, cfg.summit_sigma_m
+    )
+    summit_idx = _summit_frame_index(samples, summit_distance)
+    _prefetch_route_tiles(
+        terrain,
+        route_lats,
+        route_lons,
+        math.hypot(cfg.side_offset_m, cfg.back_offset_m),
+    )
+    summit_point = interpolate_along_route(route_points, distances, summit_distance)
+    summit_alt = (
+        terrain.height_at(summit_point.lon, summit_point.lat) or summit_point.ele
+    )
 
     candidates = [
         AutoCandidate(
@@ -580,57 +816,69 @@ def build_auto_camera_frames(
     ]
 
     best = _pick_best_candidate(
-        route_points,
+        route_lats,
+        route_lons,
+        route_eles,
         candidates,
         samples,
         distances,
         total_distance,
-        relief,
+        sample_reliefs,
+        summit_weights,
         cfg.lookahead_m,
         terrain,
-        summit_distance,
-        cfg.summit_sigma_m,
+        summit_point,
+        summit_alt,
+        summit_idx,
         cfg.summit_boost_m,
         cfg.relief_factor,
     )
 
-    # Ensure summit visibility by increasing boost if needed.
+    # Ensure summit visibility by increasing boost if needed. Only the boost
+    # changes between attempts, so the camera spot and the terrain under the
+    # sight line are sampled once.
+    cam_lat, cam_lon = _camera_position(samples, summit_idx, best)
+    cam_ground = terrain.height_at(cam_lon, cam_lat) or samples.eles[summit_idx]
+    ts, lats, lons = _ray_samples(
+        RoutePoint(cam_lat, cam_lon, cam_ground), summit_point, _LOS_STEP_M
+    )
+    heights = terrain.height_at_many(lons, lats)
     summit_boost = cfg.summit_boost_m
     for _ in range(3):
-        summit_idx = _summit_frame_index(samples, summit_distance)
-        if _is_summit_visible(
-            terrain,
-            samples[summit_idx],
-            best,
-            route_points,
-            distances,
-            relief,
-            summit_distance,
-            cfg.summit_sigma_m,
-            summit_boost,
-            cfg.relief_factor,
-        ):
+        clearance = (
+            best.base_clearance_m
+            + sample_reliefs[summit_idx] * cfg.relief_factor
+            + summit_boost * summit_weights[summit_idx]
+        )
+        if _ray_clear(ts, heights, cam_ground + clearance, summit_alt, _LOS_MARGIN_M):
             break
         summit_boost *= 1.4
 
     frames = _build_camera_frames(
-        route_points,
+        route_lats,
+        route_lons,
+        route_eles,
         samples,
         distances,
-        relief,
+        sample_reliefs,
+        summit_weights,
         total_distance,
         best,
         cfg.lookahead_m,
         terrain,
-        summit_distance,
-        cfg.summit_sigma_m,
+        summit_point,
+        summit_alt,
+        summit_idx,
         summit_boost,
         cfg.relief_factor,
     )
 
-    intro = _intro_transition(frames, cfg.intro_frames)
-    outro = _outro_transition(frames, cfg.outro_frames, route_points)
-    return intro + frames + outro
+    # The intro list is freshly built, so grow it in place rather than
+    # concatenating all three sections into yet another list.
+    cameras = _intro_transition(frames, cfg.intro_frames)
+    cameras.extend(frames)
+    cameras.extend(_outro_transition(frames, cfg.outro_frames, route_lats, route_lons))
+    return cameras
 
 
 def _intro_transition(
@@ -654,21 +902,27 @@ def _intro_transition(
     orbit_rad = math.radians(90.0)
     start_angle = base_angle + orbit_rad
     start_radius = max(base_radius * zoom_scale, base_radius + 1400.0)
+    # Every orbit position is offset from the same anchor, so the
+    # meter-to-degree scales are fixed for the whole transition.
+    m_per_deg_lat, m_per_deg_lon = _make_local_frame(target_lat)
+    angle_span = base_angle - start_angle
+    radius_span = base_radius - start_radius
+    alt_span = first.altitude - start_alt
     intro: list[FreeCameraFrame] = []
     for idx in range(count):
         t = (idx + 1) / count
         ease = t * t * (3 - 2 * t)
         zoom_phase = min(1.0, ease / 0.6)
         orbit_phase = 0.0 if ease < 0.2 else min(1.0, (ease - 0.2) / 0.8)
-        angle = start_angle + (base_angle - start_angle) * orbit_phase
-        radius = start_radius + (base_radius - start_radius) * zoom_phase
-        east = radius * math.sin(angle)
-        north = radius * math.cos(angle)
-        lat, lon = _offset_latlon(target_lat, target_lon, east, north)
+        angle = start_angle + angle_span * orbit_phase
+        radius = start_radius + radius_span * zoom_phase
         intro.append(
             FreeCameraFrame(
-                position=[lon, lat],
-                altitude=start_alt + (first.altitude - start_alt) * zoom_phase,
+                position=[
+                    target_lon + radius * math.sin(angle) / m_per_deg_lon,
+                    target_lat + radius * math.cos(angle) / m_per_deg_lat,
+                ],
+                altitude=start_alt + alt_span * zoom_phase,
                 target=start_target,
                 progress=0.0,
             )
@@ -676,20 +930,33 @@ def _intro_transition(
     return intro
 
 
+def _route_extent(lats: list[float], lons: list[float]) -> tuple[float, float, float]:
+    center_lat = (min(lats) + max(lats)) / 2
+    center_lon = (min(lons) + max(lons)) / 2
+    # The radius only sizes the framing; at route scale the equirectangular
+    # error is a small fraction of it.
+    m_per_deg_lat, m_per_deg_lon = _make_local_frame(center_lat)
+    max_dist = math.sqrt(
+        max(
+            ((lat - center_lat) * m_per_deg_lat) ** 2
+            + ((lon - center_lon) * m_per_deg_lon) ** 2
+            for lat, lon in zip(lats, lons)
+        )
+    )
+    return center_lat, center_lon, max_dist
+
+
 def _outro_transition(
-    frames: list[FreeCameraFrame], count: int, route_points: list[RoutePoint]
+    frames: list[FreeCameraFrame],
+    count: int,
+    route_lats: list[float],
+    route_lons: list[float],
 ) -> list[FreeCameraFrame]:
     if count <= 0 or not frames:
         return []
     last = frames[-1]
     zoom_scale = 2**2
-    lats = [p.lat for p in route_points]
-    lons = [p.lon for p in route_points]
-    center_lat = (min(lats) + max(lats)) / 2
-    center_lon = (min(lons) + max(lons)) / 2
-    max_dist = max(
-        haversine_m(RoutePoint(center_lat, center_lon, 0.0), p) for p in route_points
-    )
+    center_lat, center_lon, max_dist = _route_extent(route_lats, route_lons)
     end_radius = max(700.0, max_dist * 1.7)
     end_alt = max(last.altitude * 1.6, max_dist * 2.2)
     base_east, base_north = _meters_offset(
@@ -704,24 +971,31 @@ def _outro_transition(
     end_angle = base_angle + orbit_rad
     end_radius = max(end_radius, base_radius * zoom_scale, base_radius + 1400.0)
     end_alt = max(end_alt, last.altitude * zoom_scale, last.altitude + 900.0)
+    m_per_deg_lat, m_per_deg_lon = _make_local_frame(center_lat)
+    angle_span = end_angle - base_angle
+    radius_span = end_radius - base_radius
+    alt_span = end_alt - last.altitude
+    last_lon, last_lat = last.target[0], last.target[1]
+    target_lon_span = center_lon - last_lon
+    target_lat_span = center_lat - last_lat
     outro: list[FreeCameraFrame] = []
     for idx in range(count):
         t = (idx + 1) / count
         ease = t * t * (3 - 2 * t)
         zoom_phase = min(1.0, ease / 0.7)
         orbit_phase = min(1.0, ease / 0.85)
-        angle = base_angle + (end_angle - base_angle) * orbit_phase
-        radius = base_radius + (end_radius - base_radius) * zoom_phase
-        east = radius * math.sin(angle)
-        north = radius * math.cos(angle)
-        lat, lon = _offset_latlon(center_lat, center_lon, east, north)
+        angle = base_angle + angle_span * orbit_phase
+        radius = base_radius + radius_span * zoom_phase
         outro.append(
             FreeCameraFrame(
-                position=[lon, lat],
-                altitude=last.altitude + (end_alt - last.altitude) * zoom_phase,
+                position=[
+                    center_lon + radius * math.sin(angle) / m_per_deg_lon,
+                    center_lat + radius * math.cos(angle) / m_per_deg_lat,
+                ],
+                altitude=last.altitude + alt_span * zoom_phase,
                 target=[
-                    last.target[0] + (center_lon - last.target[0]) * ease,
-                    last.target[1] + (center_lat - last.target[1]) * ease,
+                    last_lon + target_lon_span * ease,
+                    last_lat + target_lat_span * ease,
                 ],
                 progress=1.0,
             )
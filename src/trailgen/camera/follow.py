@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+import functools
 import math
 from dataclasses import dataclass
+from typing import Iterator
 
 from .auto import (
     FreeCameraFrame,
     _intro_transition,
     _outro_transition,
     _ensure_visible_altitude,
-    _meters_offset,
-    _offset_latlon,
+    _make_local_frame,
+    _prefetch_route_tiles,
 )
-from trailgen.geo import RoutePoint, bearing_deg, interpolate_along_route
+from trailgen.geo import RoutePoint, interpolate_columns, route_columns
 from trailgen.terrain import TerrainSampler
 
 
@@ -30,48 +32,121 @@ class FollowCameraConfig:
     min_clearance_m: float
 
 
+@functools.lru_cache(maxsize=64)
+def _base_alpha(fps: int, smoothing_s: float) -> float:
+    dt = 1.0 / max(1, fps)
+    return 1.0 - math.exp(-dt / smoothing_s)
+
+
+def _scale_alpha(base: float, sensitivity: float) -> float:
+    return max(0.01, min(1.0, base * max(0.1, sensitivity)))
+
+
 def _alpha_from_smoothing(fps: int, smoothing_s: float, sensitivity: float) -> float:
     if smoothing_s <= 0:
         return 1.0
-    dt = 1.0 / max(1, fps)
-    base = 1.0 - math.exp(-dt / smoothing_s)
-    return max(0.01, min(1.0, base * max(0.1, sensitivity)))
+    return _scale_alpha(_base_alpha(fps, smoothing_s), sensitivity)
+
+
+def _heading_vector(
+    from_lat: float, from_lon: float, to_lat: float, to_lon: float
+) -> tuple[float, float]:
+    # Same terms as bearing_deg, normalised instead of passed through atan2,
+    # so the (cos, sin) of the bearing comes out without any angle round-trip.
+    lat1 = math.radians(from_lat)
+    lat2 = math.radians(to_lat)
+    dlon = math.radians(to_lon - from_lon)
+    cos_lat2 = math.cos(lat2)
+    y = math.sin(dlon) * cos_lat2
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * cos_lat2 * math.cos(dlon)
+    norm = math.hypot(x, y)
+    if norm == 0:
+        return 1.0, 0.0
+    return x / norm, y / norm
+
+
+def _smooth_follow_path(
+    target_lats: list[float],
+    target_lons: list[float],
+    ahead_lats: list[float],
+    ahead_lons: list[float],
+    alpha_target: float,
+    alpha_bearing: float,
+    distance_m: float,
+) -> tuple[list[float], list[float], list[float], list[float]]:
+    # Smooth in a flat east/north plane anchored at the first target; the
+    # degree-to-meter scales only depend on the anchor, so compute them once.
+    ref_lat = target_lats[0]
+    ref_lon = target_lons[0]
+    m_per_deg_lat, m_per_deg_lon = _make_local_frame(ref_lat)
+    back_lat = distance_m / m_per_deg_lat
+    tar_e, tar_n = 0.0, 0.0
+    head_x, head_y = _heading_vector(
+        target_lats[0], target_lons[0], ahead_lats[0], ahead_lons[0]
+    )
 
+    count = len(target_lats)
+    tar_lats = [0.0] * count
+    tar_lons = [0.0] * count
+    cam_lats = [0.0] * count
+    cam_lons = [0.0] * count
+    for idx, (lat, lon, ahead_lat, ahead_lon) in enumerate(
+        zip(target_lats, target_lons, ahead_lats, ahead_lons)
+    ):
+        cur_x, cur_y = _heading_vector(lat, lon, ahead_lat, ahead_lon)
+        cur_e = (lon - ref_lon) * m_per_deg_lon
+        cur_n = (lat - ref_lat) * m_per_deg_lat
+        tar_e += alpha_target * (cur_e - tar_e)
+        tar_n += alpha_target * (cur_n - tar_n)
+
+        x = head_x + alpha_bearing * (cur_x - head_x)
+        y = head_y + alpha_bearing * (cur_y - head_y)
+        norm = math.hypot(x, y)
+        if norm == 0:
+            head_x, head_y = cur_x, cur_y
+        else:
+            head_x, head_y = x / norm, y / norm
 
-def _smooth_bearing(prev_deg: float, cur_deg: float, alpha: float) -> float:
-    prev_rad = math.radians(prev_deg)
-    cur_rad = math.radians(cur_deg)
-    prev_x, prev_y = math.cos(prev_rad), math.sin(prev_rad)
-    cur_x, cur_y = math.cos(cur_rad), math.sin(cur_rad)
-    x = prev_x * (1.0 - alpha) + cur_x * alpha
-    y = prev_y * (1.0 - alpha) + cur_y * alpha
-    if x == 0 and y == 0:
-        return cur_deg
-    angle = math.degrees(math.atan2(y, x)) % 360.0
-    return angle
+        tar_lat = ref_lat + tar_n / m_per_deg_lat
+        tar_lon = ref_lon + tar_e / m_per_deg_lon
+        cam_lat = tar_lat - head_x * back_lat
+        cam_lon = tar_lon - head_y * distance_m / (
+            m_per_deg_lat * math.cos(math.radians(tar_lat))
+        )
+        tar_lats[idx] = tar_lat
+        tar_lons[idx] = tar_lon
+        cam_lats[idx] = cam_lat
+        cam_lons[idx] = cam_lon
+    return tar_lats, tar_lons, cam_lats, cam_lons
 
 
-def build_follow_camera_frames(
+def iter_follow_camera_frames(
     route_points: list[RoutePoint],
     distances: list[float],
     total_distance: float,
     cfg: FollowCameraConfig,
     terrain: TerrainSampler,
-) -> list[FreeCameraFrame]:
+) -> Iterator[FreeCameraFrame]:
     main_frames = max(2, cfg.total_frames - cfg.intro_frames - cfg.outro_frames)
-    targets: list[RoutePoint] = []
-    bearings: list[float] = []
-    progresses: list[float] = []
-
-    for frame in range(main_frames):
-        t = frame / (main_frames - 1) if main_frames > 1 else 0.0
-        target_m = t * total_distance
-        target = interpolate_along_route(route_points, distances, target_m)
-        ahead_m = min(total_distance, target_m + max(5.0, cfg.lookahead_m))
-        ahead = interpolate_along_route(route_points, distances, ahead_m)
-        bearings.append(bearing_deg(target, ahead))
-        targets.append(target)
-        progresses.append(target_m / total_distance if total_distance > 0 else 0.0)
+    lookahead_m = max(5.0, cfg.lookahead_m)
+    if total_distance > 0:
+        target_ms = [
+            frame / (main_frames - 1) * total_distance for frame in range(main_frames)
+        ]
+        progresses = [target_m / total_distance for target_m in target_ms]
+    else:
+        # Every frame of a zero-length route is the same; build one and repeat it.
+        target_ms = [0.0]
+        progresses = [0.0]
+    ahead_ms = [min(total_distance, target_m + lookahead_m) for target_m in target_ms]
+    route_lats, route_lons, route_eles = route_columns(route_points)
+    _prefetch_route_tiles(terrain, route_lats, route_lons, cfg.distance_m)
+    target_lats, target_lons, target_eles = interpolate_columns(
+        route_lats, route_lons, route_eles, distances, target_ms
+    )
+    ahead_lats, ahead_lons, _ = interpolate_columns(
+        route_lats, route_lons, route_eles, distances, ahead_ms
+    )
 
     alpha_target = _alpha_from_smoothing(
         cfg.fps, cfg.smoothing_s, cfg.panning_sensitivity
@@ -81,62 +156,74 @@ def build_follow_camera_frames(
     )
     alpha_alt = _alpha_from_smoothing(cfg.fps, cfg.smoothing_s, 1.0)
 
-    ref_lat = targets[0].lat
-    ref_lon = targets[0].lon
-    tar_e, tar_n = _meters_offset(ref_lat, ref_lon, targets[0].lat, targets[0].lon)
-    smoothed_bearing = bearings[0]
-    smoothed_alt = None
-
-    frames: list[FreeCameraFrame] = []
     pitch_rad = math.radians(max(5.0, min(85.0, cfg.pitch_deg)))
     vertical_from_target = cfg.distance_m / math.tan(pitch_rad)
 
-    for idx, target in enumerate(targets):
-        cur_e, cur_n = _meters_offset(ref_lat, ref_lon, target.lat, target.lon)
-        tar_e = tar_e * (1.0 - alpha_target) + cur_e * alpha_target
-        tar_n = tar_n * (1.0 - alpha_target) + cur_n * alpha_target
-        smoothed_bearing = _smooth_bearing(
-            smoothed_bearing, bearings[idx], alpha_bearing
-        )
+    # Target and bearing smoothing do not depend on terrain, so lay out every
+    # camera position first and sample the DEM in two batched passes.
+    tar_lats, tar_lons, cam_lats, cam_lons = _smooth_follow_path(
+        target_lats,
+        target_lons,
+        ahead_lats,
+        ahead_lons,
+        alpha_target,
+        alpha_bearing,
+        cfg.distance_m,
+    )
 
-        tar_lat, tar_lon = _offset_latlon(ref_lat, ref_lon, tar_e, tar_n)
-        heading = math.radians(smoothed_bearing)
-        east = math.sin(heading) * -cfg.distance_m
-        north = math.cos(heading) * -cfg.distance_m
-        cam_lat, cam_lon = _offset_latlon(tar_lat, tar_lon, east, north)
+    target_heights = terrain.height_at_many(tar_lons, tar_lats)
+    cam_heights = terrain.height_at_many(cam_lons, cam_lats)
 
-        target_alt = terrain.height_at(tar_lon, tar_lat) or target.ele
-        cam_ground = terrain.height_at(cam_lon, cam_lat) or target.ele
+    def camera_altitude(idx: int) -> float:
+        target_alt = target_heights[idx] or target_eles[idx]
+        cam_ground = cam_heights[idx] or target_eles[idx]
         desired_alt = target_alt + vertical_from_target
         if desired_alt < cam_ground + cfg.min_clearance_m:
             desired_alt = cam_ground + cfg.min_clearance_m
 
         cam_alt, _ = _ensure_visible_altitude(
             terrain,
-            cam_lat,
-            cam_lon,
+            cam_lats[idx],
+            cam_lons[idx],
             cam_ground,
             desired_alt,
-            RoutePoint(tar_lat, tar_lon, target_alt),
+            RoutePoint(tar_lats[idx], tar_lons[idx], target_alt),
             target_alt,
             max_raise_m=900.0,
             step_m=60.0,
         )
-
-        if smoothed_alt is None:
-            smoothed_alt = cam_alt
-        else:
-            smoothed_alt = smoothed_alt * (1.0 - alpha_alt) + cam_alt * alpha_alt
-
-        frames.append(
-            FreeCameraFrame(
-                position=[cam_lon, cam_lat],
-                altitude=smoothed_alt,
-                target=[tar_lon, tar_lat],
-                progress=progresses[idx],
-            )
+        return cam_alt
+
+    def frame_at(idx: int, altitude: float) -> FreeCameraFrame:
+        return FreeCameraFrame(
+            position=[cam_lons[idx], cam_lats[idx]],
+            altitude=altitude,
+            target=[tar_lons[idx], tar_lats[idx]],
+            progress=progresses[idx],
         )
 
-    intro = _intro_transition(frames, cfg.intro_frames)
-    outro = _outro_transition(frames, cfg.outro_frames, route_points)
-    return intro + frames + outro
+    # Only the first and last main frames are needed for the transitions, so
+    # the frame objects are yielded as they are made rather than collected.
+    smoothed_alt = camera_altitude(0)
+    last = frame_at(0, smoothed_alt)
+    yield from _intro_transition([last], cfg.intro_frames)
+    yield last
+    for idx in range(1, len(tar_lats)):
+        smoothed_alt += alpha_alt * (camera_altitude(idx) - smoothed_alt)
+        last = frame_at(idx, smoothed_alt)
+        yield last
+    for _ in range(main_frames - len(tar_lats)):
+        yield last
+    yield from _outro_transition([last], cfg.outro_frames, route_lats, route_lons)
+
+
+def build_follow_camera_frames(
+    route_points: list[RoutePoint],
+    distances: list[float],
+    total_distance: float,
+    cfg: FollowCameraConfig,
+    terrain: TerrainSampler,
+) -> list[FreeCameraFrame]:
+    return list(
+        iter_follow_camera_frames(route_points, distances, total_distance, cfg, terrain)
+    )
@@ -1,21 +1,19 @@
 from __future__ import annotations
 
 import argparse
-import getpass
+import functools
 import logging
 import os
-from dataclasses import replace
+import sys
+from dataclasses import fields, replace
 from pathlib import Path
 
-from dotenv import load_dotenv
-
 from trailgen.config import (
     load_app_config,
     parse_size,
     resolve_config_path,
     save_app_config,
 )
-from trailgen.render import RenderOptions, render_video
 
 RESOLUTION_DIMENSIONS = {
     "720p": (1280, 720),
@@ -23,22 +21,70 @@ RESOLUTION_DIMENSIONS = {
     "4k": (3840, 2160),
 }
 
-_DEBUG_VALUES = {"1", "true", "yes", "on"}
+# Final (width, height) per (resolution, orientation); portrait swaps the sides.
+_PRESET_DIMENSIONS = {
+    (resolution, orientation): (
+        (height, width) if orientation == "portrait" else (width, height)
+    )
+    for resolution, (width, height) in RESOLUTION_DIMENSIONS.items()
+    for orientation in ("portrait", "landscape")
+}
+
+# The standard level names (and aliases) logging.getLevelName resolves.
+_LOG_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+    "ERROR": logging.ERROR,
+    "WARN": logging.WARN,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+_DEBUG_VALUES = frozenset({"1", "true", "yes", "on"})
+_VALID_PROVIDERS = frozenset({"maptiler", "mapbox"})
+_VALID_ENCODINGS = frozenset({"mapbox", "terrarium"})
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# RenderOptions fields whose value comes from a differently named CLI flag.
+_RENDER_OPTION_ARGS = {
+    "gpx_path": "gpx",
+    "out_path": "out",
+    "follow_pitch_deg": "follow_pitch",
+}
 
 
 def _parse_log_level(value: str | None) -> int | None:
     if not value:
         return None
-    level = logging.getLevelName(value.upper())
-    return level if isinstance(level, int) else None
+    return _LOG_LEVELS.get(value.upper())
+
+
+def _find_dotenv() -> Path | None:
+    # Same lookup load_dotenv() does on its own: a .env file next to this
+    # module or in any parent directory.
+    here = Path(os.path.abspath(__file__)).parent
+    for directory in (here, *here.parents):
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
 
 
 def configure_logging() -> None:
-    level = _parse_log_level(os.getenv("TRAILGEN_LOG_LEVEL"))
+    env = os.environ
+    level = _parse_log_level(env.get("TRAILGEN_LOG_LEVEL"))
     if level is None:
-        debug = os.getenv("TRAILGEN_DEBUG", "").lower() in _DEBUG_VALUES
+        debug = env.get("TRAILGEN_DEBUG", "").lower() in _DEBUG_VALUES
         level = logging.DEBUG if debug else logging.INFO
+    _apply_logging_config(level)
+
 
+@functools.lru_cache(maxsize=1)
+def _apply_logging_config(level: int) -> None:
+    # The level is read after .env is loaded, so it cannot be fixed at import;
+    # but repeated main() calls with an unchanged level skip the forced reset.
     logging.basicConfig(
         level=level,
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
@@ -58,24 +104,17 @@ def resolve_dimensions(
     if width is not None and height is not None:
         return width, height
 
-    base_width, base_height = RESOLUTION_DIMENSIONS[args.resolution]
-    if args.orientation == "portrait":
-        return base_height, base_width
-    return base_width, base_height
+    return _PRESET_DIMENSIONS[(args.resolution, args.orientation)]
 
 
 def _format_bytes(value: int) -> str:
     if value <= 0:
         return "0 B"
-    units = ["B", "KB", "MB", "GB", "TB"]
-    size = float(value)
-    for unit in units:
-        if size < 1024 or unit == units[-1]:
-            if unit == "B":
-                return f"{int(size)} {unit}"
-            return f"{size:.2f} {unit}"
-        size /= 1024
-    return f"{int(value)} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks it.
+    shift = min((value.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    if shift == 0:
+        return f"{value} B"
+    return f"{value / (1 << (10 * shift)):.2f} {_BYTE_UNITS[shift]}"
 
 
 def _prompt_value(
@@ -88,6 +127,9 @@ def _prompt_value(
 ):
     while True:
         if secret:
+            # Only secret prompts need getpass (and termios behind it).
+            import getpass
+
             current_hint = "set" if current else "not set"
             prompt = f"{label} [{current_hint}]: "
             value = getpass.getpass(prompt)
@@ -109,7 +151,7 @@ def _prompt_value(
 def _prompt_provider(current: str) -> str:
     def parse_provider(value: str) -> str:
         lowered = value.strip().lower()
-        if lowered not in {"maptiler", "mapbox"}:
+        if lowered not in _VALID_PROVIDERS:
             raise ValueError("Use 'maptiler' or 'mapbox'.")
         return lowered
 
@@ -120,11 +162,52 @@ def _prompt_provider(current: str) -> str:
 
 def _validate_provider(value: str) -> str:
     lowered = value.strip().lower()
-    if lowered not in {"maptiler", "mapbox"}:
+    if lowered not in _VALID_PROVIDERS:
         raise ValueError("Map provider must be 'maptiler' or 'mapbox'.")
     return lowered
 
 
+def _parse_encoding(value: str) -> str:
+    lowered = value.strip().lower()
+    if lowered not in _VALID_ENCODINGS:
+        raise ValueError("Use 'mapbox' or 'terrarium'.")
+    return lowered
+
+
+def _parse_positive_float(value: str) -> float:
+    parsed = float(value)
+    if parsed <= 0:
+        raise ValueError("Value must be greater than 0.")
+    return parsed
+
+
+def _parse_timeout_ms(value: str) -> int:
+    parsed = int(float(value))
+    if parsed <= 0:
+        raise ValueError("Value must be greater than 0.")
+    return parsed
+
+
+# Settings prompted for in order after the provider credentials and cache
+# settings: (AppConfig field / CLI dest, prompt label, value parser, fallback
+# shown when the current config has no value).
+_PROMPTED_FIELDS = (
+    ("style_url", "Map style URL (optional)", None, None),
+    ("terrain_tiles", "Terrain tiles URL (optional)", None, None),
+    (
+        "terrain_encoding",
+        "Terrain encoding (mapbox|terrarium)",
+        _parse_encoding,
+        "mapbox",
+    ),
+    ("terrain_exaggeration", "Terrain exaggeration", _parse_positive_float, 1.2),
+    ("max_zoom", "Max zoom (optional)", _parse_positive_float, None),
+    ("page_timeout_ms", "Page timeout (ms)", _parse_timeout_ms, None),
+    ("frame_timeout_ms", "Frame timeout (ms, optional)", _parse_timeout_ms, None),
+    ("tile_timeout_s", "Tile timeout (seconds)", _parse_positive_float, None),
+)
+
+
 def handle_configure(args: argparse.Namespace) -> None:
     config_path = resolve_config_path(args.config_path)
     current = load_app_config(config_path, include_env=False)
@@ -166,36 +249,6 @@ def handle_configure(args: argparse.Namespace) -> None:
             else _prompt_provider(current.map_provider)
         )
 
-        def parse_encoding(value: str) -> str:
-            lowered = value.strip().lower()
-            if lowered not in {"mapbox", "terrarium"}:
-                raise ValueError("Use 'mapbox' or 'terrarium'.")
-            return lowered
-
-        def parse_exaggeration(value: str) -> float:
-            parsed = float(value)
-            if parsed <= 0:
-                raise ValueError("Value must be greater than 0.")
-            return parsed
-
-        def parse_max_zoom(value: str) -> float:
-            parsed = float(value)
-            if parsed <= 0:
-                raise ValueError("Value must be greater than 0.")
-            return parsed
-
-        def parse_timeout_ms(value: str) -> int:
-            parsed = int(float(value))
-            if parsed <= 0:
-                raise ValueError("Value must be greater than 0.")
-            return parsed
-
-        def parse_timeout_s(value: str) -> float:
-            parsed = float(value)
-            if parsed <= 0:
-                raise ValueError("Value must be greater than 0.")
-            return parsed
-
         maptiler_key = current.maptiler_key
         mapbox_token = current.mapbox_token
         if provider == "maptiler":
@@ -225,75 +278,7 @@ def handle_configure(args: argparse.Namespace) -> None:
                 "Cache max size",
                 current.cache_max_bytes,
                 display=_format_bytes(current.cache_max_bytes),
-                parser=lambda v: parse_size(v, current.cache_max_bytes),
-            )
-        )
-        style_url = (
-            args.style_url
-            if args.style_url is not None
-            else _prompt_value("Map style URL (optional)", current.style_url)
-        )
-        terrain_tiles = (
-            args.terrain_tiles
-            if args.terrain_tiles is not None
-            else _prompt_value("Terrain tiles URL (optional)", current.terrain_tiles)
-        )
-        terrain_encoding = (
-            args.terrain_encoding
-            if args.terrain_encoding is not None
-            else _prompt_value(
-                "Terrain encoding (mapbox|terrarium)",
-                current.terrain_encoding or "mapbox",
-                parser=parse_encoding,
-            )
-        )
-        terrain_exaggeration = (
-            args.terrain_exaggeration
-            if args.terrain_exaggeration is not None
-            else _prompt_value(
-                "Terrain exaggeration",
-                (
-                    current.terrain_exaggeration
-                    if current.terrain_exaggeration is not None
-                    else 1.2
-                ),
-                parser=parse_exaggeration,
-            )
-        )
-        max_zoom = (
-            args.max_zoom
-            if args.max_zoom is not None
-            else _prompt_value(
-                "Max zoom (optional)",
-                current.max_zoom,
-                parser=parse_max_zoom,
-            )
-        )
-        page_timeout_ms = (
-            args.page_timeout_ms
-            if args.page_timeout_ms is not None
-            else _prompt_value(
-                "Page timeout (ms)",
-                current.page_timeout_ms,
-                parser=parse_timeout_ms,
-            )
-        )
-        frame_timeout_ms = (
-            args.frame_timeout_ms
-            if args.frame_timeout_ms is not None
-            else _prompt_value(
-                "Frame timeout (ms, optional)",
-                current.frame_timeout_ms,
-                parser=parse_timeout_ms,
-            )
-        )
-        tile_timeout_s = (
-            args.tile_timeout_s
-            if args.tile_timeout_s is not None
-            else _prompt_value(
-                "Tile timeout (seconds)",
-                current.tile_timeout_s,
-                parser=parse_timeout_s,
+                parser=functools.partial(parse_size, default=current.cache_max_bytes),
             )
         )
 
@@ -301,312 +286,354 @@ def handle_configure(args: argparse.Namespace) -> None:
             "map_provider": provider,
             "maptiler_key": maptiler_key,
             "mapbox_token": mapbox_token,
-            "style_url": style_url,
-            "terrain_tiles": terrain_tiles,
-            "terrain_encoding": terrain_encoding,
-            "terrain_exaggeration": terrain_exaggeration,
-            "max_zoom": max_zoom,
             "cache_dir": cache_dir,
             "cache_max_bytes": cache_max_bytes,
-            "page_timeout_ms": page_timeout_ms,
-            "frame_timeout_ms": frame_timeout_ms,
-            "tile_timeout_s": tile_timeout_s,
         }
+        for field, label, parse, fallback in _PROMPTED_FIELDS:
+            value = getattr(args, field)
+            if value is None:
+                value = getattr(current, field)
+                if value is None:
+                    value = fallback
+                value = _prompt_value(label, value, parser=parse)
+            updates[field] = value
 
     updated = replace(current, **updates)
     path = save_app_config(updated, config_path)
     print(f"Saved config to {path}")
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="trailgen",
-        description="Generate 3D trail videos from GPX files.",
-    )
-    sub = parser.add_subparsers(dest="command", required=True)
-
-    configure = sub.add_parser(
-        "configure", help="Configure default settings (stored on disk)."
-    )
-    configure.add_argument(
+_CONFIGURE_ARGUMENTS: tuple[tuple[str, dict[str, object]], ...] = (
+    (
         "--config-path",
-        type=Path,
-        default=None,
-        help="Optional config file path override.",
-    )
-    configure.add_argument(
+        {"type": Path, "default": None, "help": "Optional config file path override."},
+    ),
+    (
         "--map-provider",
-        choices=["maptiler", "mapbox"],
-        default=None,
-        help="Map provider (maptiler or mapbox).",
-    )
-    configure.add_argument(
-        "--maptiler-key", type=str, default=None, help="MapTiler API key."
-    )
-    configure.add_argument(
-        "--mapbox-token", type=str, default=None, help="Mapbox access token."
-    )
-    configure.add_argument(
+        {
+            "choices": ["maptiler", "mapbox"],
+            "default": None,
+            "help": "Map provider (maptiler or mapbox).",
+        },
+    ),
+    ("--maptiler-key", {"type": str, "default": None, "help": "MapTiler API key."}),
+    ("--mapbox-token", {"type": str, "default": None, "help": "Mapbox access token."}),
+    (
         "--style-url",
-        type=str,
-        default=None,
-        help="Map style URL template (supports {key} or {token}).",
-    )
-    configure.add_argument(
+        {
+            "type": str,
+            "default": None,
+            "help": "Map style URL template (supports {key} or {token}).",
+        },
+    ),
+    (
         "--terrain-tiles",
-        type=str,
-        default=None,
-        help="Terrain tiles URL template (supports {key} or {token}).",
-    )
-    configure.add_argument(
+        {
+            "type": str,
+            "default": None,
+            "help": "Terrain tiles URL template (supports {key} or {token}).",
+        },
+    ),
+    (
         "--terrain-encoding",
-        type=str,
-        choices=["mapbox", "terrarium"],
-        default=None,
-        help="Terrain tile encoding.",
-    )
-    configure.add_argument(
+        {
+            "type": str,
+            "choices": ["mapbox", "terrarium"],
+            "default": None,
+            "help": "Terrain tile encoding.",
+        },
+    ),
+    (
         "--terrain-exaggeration",
-        type=float,
-        default=None,
-        help="Terrain exaggeration multiplier.",
-    )
-    configure.add_argument(
-        "--max-zoom",
-        type=float,
-        default=None,
-        help="Override map max zoom.",
-    )
-    configure.add_argument(
+        {"type": float, "default": None, "help": "Terrain exaggeration multiplier."},
+    ),
+    ("--max-zoom", {"type": float, "default": None, "help": "Override map max zoom."}),
+    (
         "--cache-dir",
-        type=Path,
-        default=None,
-        help="Cache directory for tiles.",
-    )
-    configure.add_argument(
+        {"type": Path, "default": None, "help": "Cache directory for tiles."},
+    ),
+    (
         "--cache-max",
-        type=str,
-        default=None,
-        help="Cache size limit (bytes or KB/MB/GB/TB).",
-    )
-    configure.add_argument(
+        {
+            "type": str,
+            "default": None,
+            "help": "Cache size limit (bytes or KB/MB/GB/TB).",
+        },
+    ),
+    (
         "--page-timeout-ms",
-        type=int,
-        default=None,
-        help="Playwright page timeout in milliseconds.",
-    )
-    configure.add_argument(
+        {
+            "type": int,
+            "default": None,
+            "help": "Playwright page timeout in milliseconds.",
+        },
+    ),
+    (
         "--frame-timeout-ms",
-        type=int,
-        default=None,
-        help="Renderer frame timeout in milliseconds.",
-    )
-    configure.add_argument(
+        {
+            "type": int,
+            "default": None,
+            "help": "Renderer frame timeout in milliseconds.",
+        },
+    ),
+    (
         "--tile-timeout-s",
-        type=float,
-        default=None,
-        help="Tile download timeout in seconds.",
-    )
-    configure.add_argument(
+        {"type": float, "default": None, "help": "Tile download timeout in seconds."},
+    ),
+    (
         "--non-interactive",
-        action="store_true",
-        help="Do not prompt; only use provided flags.",
-        default=False,
-    )
+        {
+            "action": "store_true",
+            "help": "Do not prompt; only use provided flags.",
+            "default": False,
+        },
+    ),
+)
 
-    render = sub.add_parser("render", help="Render a 3D trail video from a GPX file.")
-    render.add_argument("--gpx", required=True, type=Path, help="Path to a GPX file.")
-    render.add_argument(
-        "--out", required=True, type=Path, help="Output video path (mp4)."
-    )
-    render.add_argument("--fps", type=int, default=30, help="Frames per second.")
-    render.add_argument(
+
+_RENDER_ARGUMENTS: tuple[tuple[str, dict[str, object]], ...] = (
+    ("--gpx", {"required": True, "type": Path, "help": "Path to a GPX file."}),
+    ("--out", {"required": True, "type": Path, "help": "Output video path (mp4)."}),
+    ("--fps", {"type": int, "default": 30, "help": "Frames per second."}),
+    (
         "--resolution",
-        choices=["720p", "1080p", "4k"],
-        default="720p",
-        help="Preset resolution (ignored if --width/--height are set).",
-    )
-    render.add_argument(
+        {
+            "choices": ["720p", "1080p", "4k"],
+            "default": "720p",
+            "help": "Preset resolution (ignored if --width/--height are set).",
+        },
+    ),
+    (
         "--orientation",
-        choices=["portrait", "landscape"],
-        default="portrait",
-        help="Orientation for preset resolutions.",
-    )
-    render.add_argument(
-        "--width", type=int, default=None, help="Frame width in pixels."
-    )
-    render.add_argument(
-        "--height", type=int, default=None, help="Frame height in pixels."
-    )
-    render.add_argument(
+        {
+            "choices": ["portrait", "landscape"],
+            "default": "portrait",
+            "help": "Orientation for preset resolutions.",
+        },
+    ),
+    ("--width", {"type": int, "default": None, "help": "Frame width in pixels."}),
+    ("--height", {"type": int, "default": None, "help": "Frame height in pixels."}),
+    (
         "--duration",
-        type=float,
-        default=None,
-        help="Target video duration in seconds. Overrides --speed-kmh if set.",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": None,
+            "help": "Target video duration in seconds. Overrides --speed-kmh if set.",
+        },
+    ),
+    (
         "--quality",
-        choices=["preview", "final"],
-        default="final",
-        help="Quality preset (preview renders faster, final renders with full tiles).",
-    )
-    render.add_argument(
+        {
+            "choices": ["preview", "final"],
+            "default": "final",
+            "help": (
+                "Quality preset (preview renders faster, final renders with full "
+                "tiles)."
+            ),
+        },
+    ),
+    (
         "--lookahead-m",
-        type=float,
-        default=None,
-        help="Override auto camera lookahead distance in meters.",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": None,
+            "help": "Override auto camera lookahead distance in meters.",
+        },
+    ),
+    (
         "--speed-kmh",
-        type=float,
-        default=20.0,
-        help="Route speed in km/h for computing duration.",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 20.0,
+            "help": "Route speed in km/h for computing duration.",
+        },
+    ),
+    (
         "--camera-mode",
-        choices=["auto", "follow"],
-        default="auto",
-        help="Camera mode (auto for adaptive, follow for fixed distance/pitch).",
-    )
-    render.add_argument(
+        {
+            "choices": ["auto", "follow"],
+            "default": "auto",
+            "help": "Camera mode (auto for adaptive, follow for fixed distance/pitch).",
+        },
+    ),
+    (
         "--follow-distance-m",
-        type=float,
-        default=500.0,
-        help="Follow mode camera distance from target (meters).",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 500.0,
+            "help": "Follow mode camera distance from target (meters).",
+        },
+    ),
+    (
         "--follow-pitch",
-        type=float,
-        default=60.0,
-        help="Follow mode camera pitch in degrees (0=top-down, 60=oblique).",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 60.0,
+            "help": "Follow mode camera pitch in degrees (0=top-down, 60=oblique).",
+        },
+    ),
+    (
         "--follow-lookahead-m",
-        type=float,
-        default=120.0,
-        help="Follow mode lookahead distance for bearing (meters).",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 120.0,
+            "help": "Follow mode lookahead distance for bearing (meters).",
+        },
+    ),
+    (
         "--follow-bearing-sensitivity",
-        type=float,
-        default=3.0,
-        help="Follow mode bearing responsiveness (higher = more reactive).",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 3.0,
+            "help": "Follow mode bearing responsiveness (higher = more reactive).",
+        },
+    ),
+    (
         "--follow-panning-sensitivity",
-        type=float,
-        default=1.5,
-        help="Follow mode target responsiveness (higher = more reactive).",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 1.5,
+            "help": "Follow mode target responsiveness (higher = more reactive).",
+        },
+    ),
+    (
         "--follow-smoothing-s",
-        type=float,
-        default=0.5,
-        help="Follow mode smoothing window in seconds.",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 0.5,
+            "help": "Follow mode smoothing window in seconds.",
+        },
+    ),
+    (
         "--follow-min-clearance-m",
-        type=float,
-        default=30.0,
-        help="Minimum camera clearance above terrain in follow mode (meters).",
-    )
-    render.add_argument(
+        {
+            "type": float,
+            "default": 30.0,
+            "help": "Minimum camera clearance above terrain in follow mode (meters).",
+        },
+    ),
+    (
         "--route-smooth",
-        type=int,
-        default=1,
-        help="Chaikin smoothing iterations for the route line.",
-    )
-    render.add_argument(
-        "--route-color",
-        type=str,
-        default="#3b82f6",
-        help="Route line color.",
-    )
-    render.add_argument(
-        "--route-width",
-        type=float,
-        default=4.0,
-        help="Route line width.",
-    )
-    render.add_argument(
+        {
+            "type": int,
+            "default": 1,
+            "help": "Chaikin smoothing iterations for the route line.",
+        },
+    ),
+    ("--route-color", {"type": str, "default": "#3b82f6", "help": "Route line color."}),
+    ("--route-width", {"type": float, "default": 4.0, "help": "Route line width."}),
+    (
         "--intro-seconds",
-        type=float,
-        default=2.5,
-        help="Intro fly-in duration in seconds.",
-    )
-    render.add_argument(
+        {"type": float, "default": 2.5, "help": "Intro fly-in duration in seconds."},
+    ),
+    (
         "--outro-seconds",
-        type=float,
-        default=2.0,
-        help="Outro fly-out duration in seconds.",
-    )
-    render.add_argument(
+        {"type": float, "default": 2.0, "help": "Outro fly-out duration in seconds."},
+    ),
+    (
         "--frames-dir",
-        type=Path,
-        default=None,
-        help="Directory to write frames to. Defaults to a temp directory.",
-    )
-    render.add_argument(
+        {
+            "type": Path,
+            "default": None,
+            "help": "Directory to write frames to. Defaults to a temp directory.",
+        },
+    ),
+    (
         "--keep-frames",
-        action="store_true",
-        help="Keep frame PNGs after encoding.",
-        default=False,
-    )
-    render.add_argument(
+        {
+            "action": "store_true",
+            "help": "Keep frame PNGs after encoding.",
+            "default": False,
+        },
+    ),
+    (
         "--crf",
-        type=int,
-        default=18,
-        help="H.264 CRF value (lower is higher quality).",
-    )
-    render.add_argument(
+        {
+            "type": int,
+            "default": 18,
+            "help": "H.264 CRF value (lower is higher quality).",
+        },
+    ),
+    (
         "--preset",
-        type=str,
-        default="slow",
-        help="FFmpeg preset (e.g., veryfast, fast, medium, slow).",
+        {
+            "type": str,
+            "default": "slow",
+            "help": "FFmpeg preset (e.g., veryfast, fast, medium, slow).",
+        },
+    ),
+)
+
+
+_SUBCOMMANDS = (
+    (
+        "configure",
+        "Configure default settings (stored on disk).",
+        _CONFIGURE_ARGUMENTS,
+    ),
+    ("render", "Render a 3D trail video from a GPX file.", _RENDER_ARGUMENTS),
+)
+
+
+def build_parser(argv: list[str] | None = None) -> argparse.ArgumentParser:
+    # When the command line is known, only the chosen subcommand gets its full
+    # set of arguments; the others are registered with just their help text.
+    command = argv[0] if argv else None
+    return _cached_parser(
+        tuple(name for name, _, _ in _SUBCOMMANDS if argv is None or name == command)
     )
 
+
+@functools.lru_cache(maxsize=None)
+def _cached_parser(full_commands: tuple[str, ...]) -> argparse.ArgumentParser:
+    # Parsing does not modify the parser, so one instance per set of fully
+    # built subcommands is shared between calls.
+    parser = argparse.ArgumentParser(
+        prog="trailgen",
+        description="Generate 3D trail videos from GPX files.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text, arguments in _SUBCOMMANDS:
+        subparser = sub.add_parser(name, help=help_text)
+        if name in full_commands:
+            for flag, options in arguments:
+                subparser.add_argument(flag, **options)
+
     return parser
 
 
 def main() -> None:
-    load_dotenv()
+    dotenv_path = _find_dotenv()
+    if dotenv_path is not None:
+        from dotenv import load_dotenv
+
+        load_dotenv(dotenv_path)
     configure_logging()
-    parser = build_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    parser = build_parser(argv)
+    args = parser.parse_args(argv)
 
     if args.command == "configure":
         handle_configure(args)
         return
 
     if args.command == "render":
+        # The render stack pulls in playwright and rich; keep it off the path
+        # of configure and --help.
+        from trailgen.render import RenderOptions, render_video
+
         width, height = resolve_dimensions(args, parser)
+        # Options are copied straight from the parsed namespace; only a few
+        # fields are named differently from their flags.
+        arg_values = vars(args)
         options = RenderOptions(
-            gpx_path=args.gpx,
-            out_path=args.out,
-            fps=args.fps,
+            **{
+                field.name: arg_values[_RENDER_OPTION_ARGS.get(field.name, field.name)]
+                for field in fields(RenderOptions)
+                if field.name not in ("width", "height")
+            },
             width=width,
             height=height,
-            duration=args.duration,
-            speed_kmh=args.speed_kmh,
-            quality=args.quality,
-            lookahead_m=args.lookahead_m,
-            intro_seconds=args.intro_seconds,
-            outro_seconds=args.outro_seconds,
-            route_smooth=args.route_smooth,
-            route_color=args.route_color,
-            route_width=args.route_width,
-            frames_dir=args.frames_dir,
-            keep_frames=args.keep_frames,
-            crf=args.crf,
-            preset=args.preset,
-            camera_mode=args.camera_mode,
-            follow_distance_m=args.follow_distance_m,
-            follow_pitch_deg=args.follow_pitch,
-            follow_lookahead_m=args.follow_lookahead_m,
-            follow_bearing_sensitivity=args.follow_bearing_sensitivity,
-            follow_panning_sensitivity=args.follow_panning_sensitivity,
-            follow_smoothing_s=args.follow_smoothing_s,
-            follow_min_clearance_m=args.follow_min_clearance_m,
         )
         render_video(options)
 
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-import configparser
-import io
+import functools
 import os
+import stat
 import sys
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    import configparser
 
 
 MAPTILER_STYLE = "https://api.maptiler.com/maps/hybrid-v4/style.json?key={key}"
@@ -28,8 +32,11 @@ DEFAULT_PROVIDER = "maptiler"
 DEFAULT_PAGE_TIMEOUT_MS = 120_000
 DEFAULT_TILE_TIMEOUT_S = 20.0
 
+# Every unit suffix is two characters, so a size's unit is just its tail.
+_SIZE_UNITS = {"kb": 1024, "mb": 1024**2, "gb": 1024**3, "tb": 1024**4}
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     map_provider: str
     maptiler_key: str | None
@@ -46,7 +53,7 @@ class AppConfig:
     tile_timeout_s: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MapConfig:
     style_url: str | None
     style_attribution: str | None
@@ -62,6 +69,9 @@ class MapConfig:
     blank_style: bool = False
 
 
+# Resolved once per process: the platform lookups below do not change after
+# startup (.env has already been loaded by then).
+@functools.lru_cache(maxsize=1)
 def _default_config_dir() -> Path:
     if os.name == "nt":
         base = Path(os.getenv("APPDATA", Path.home() / "AppData" / "Roaming"))
@@ -88,18 +98,18 @@ def _default_cache_dir() -> Path:
 def parse_size(value: str | None, default: int) -> int:
     if not value:
         return default
-    text = value.strip().lower()
+    text = value.strip()
     if not text:
         return default
     if text.isdigit():
         return max(0, int(text))
-    units = {"kb": 1024, "mb": 1024**2, "gb": 1024**3, "tb": 1024**4}
-    for suffix, multiplier in units.items():
-        if text.endswith(suffix):
-            number = text[: -len(suffix)].strip()
-            if not number:
-                raise ValueError("Missing size value.")
-            return max(0, int(float(number) * multiplier))
+    text = text.lower()
+    multiplier = _SIZE_UNITS.get(text[-2:])
+    if multiplier is not None:
+        number = text[:-2].strip()
+        if not number:
+            raise ValueError("Missing size value.")
+        return max(0, int(float(number) * multiplier))
     raise ValueError(f"Unrecognized size '{value}'. Use bytes or KB/MB/GB/TB.")
 
 
@@ -122,14 +132,48 @@ def _parse_float(value: str | None, name: str) -> float | None:
         raise ValueError(f"Invalid {name}: {value!r}") from None
 
 
+@functools.lru_cache(maxsize=8)
+def _read_config_file(
+    path: str, inode: int, mtime_ns: int, size: int
+) -> configparser.ConfigParser:
+    # Keyed by the file's inode, mtime and size, so a rewritten config is
+    # re-read. save_app_config replaces the file, which changes the inode even
+    # when a same-length rewrite lands in the same timestamp tick. Callers only
+    # read from the returned parser.
+    import configparser
+
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return parser
+
+
+def _load_config_section(path: Path) -> Mapping[str, str]:
+    # configparser is only imported once there is a file to read, so runs
+    # without a saved config (and --help) skip it entirely.
+    try:
+        info = path.stat()
+    except OSError:
+        return {}
+    if not stat.S_ISREG(info.st_mode):
+        return {}
+    parser = _read_config_file(str(path), info.st_ino, info.st_mtime_ns, info.st_size)
+    return parser["default"] if parser.has_section("default") else {}
+
+
+def _first_env(env: Mapping[str, str], *names: str) -> str | None:
+    # The first of several alias variables that is set to a non-empty value.
+    for name in names:
+        value = env.get(name)
+        if value:
+            return value
+    return None
+
+
 def load_app_config(
     config_path: Path | None = None, include_env: bool = True
 ) -> AppConfig:
     path = resolve_config_path(config_path)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    section = parser["default"] if parser.has_section("default") else {}
+    section = _load_config_section(path)
 
     provider = _clean(section.get("map_provider")) or DEFAULT_PROVIDER
     maptiler_key = _clean(section.get("maptiler_key"))
@@ -154,27 +198,29 @@ def load_app_config(
     cache_max_bytes = parse_size(cache_max, DEFAULT_CACHE_MAX_BYTES)
 
     if include_env:
-        provider = os.getenv("MAP_PROVIDER", provider)
+        # One mapping for all the lookups below instead of a getenv() call
+        # (and its module attribute lookup) per variable.
+        env = os.environ
+        provider = env.get("MAP_PROVIDER", provider)
         maptiler_key = (
-            os.getenv("TRAILGEN_MAPTILER_KEY")
-            or os.getenv("MAPTILER_KEY")
-            or maptiler_key
+            _first_env(env, "TRAILGEN_MAPTILER_KEY", "MAPTILER_KEY") or maptiler_key
         )
-        mapbox_token = os.getenv("MAPBOX_TOKEN") or mapbox_token
+        mapbox_token = env.get("MAPBOX_TOKEN") or mapbox_token
 
-        style_url = os.getenv("TRAILGEN_STYLE_URL") or style_url
-        terrain_tiles = os.getenv("TRAILGEN_TERRAIN_TILES") or terrain_tiles
+        style_url = env.get("TRAILGEN_STYLE_URL") or style_url
+        terrain_tiles = env.get("TRAILGEN_TERRAIN_TILES") or terrain_tiles
 
         if provider.lower() == "mapbox":
-            style_url = os.getenv("MAPBOX_STYLE_URL") or style_url
-            terrain_tiles = os.getenv("MAPBOX_TERRAIN_TILES") or terrain_tiles
+            style_url = env.get("MAPBOX_STYLE_URL") or style_url
+            terrain_tiles = env.get("MAPBOX_TERRAIN_TILES") or terrain_tiles
 
-        terrain_encoding = os.getenv("TRAILGEN_TERRAIN_ENCODING") or terrain_encoding
+        terrain_encoding = env.get("TRAILGEN_TERRAIN_ENCODING") or terrain_encoding
 
-        terrain_exaggeration_env = (
-            os.getenv("TRAILGEN_TERRAIN_EXAGGERATION")
-            or os.getenv("MAP_TERRAIN_EXAGGERATION")
-            or os.getenv("TERRAIN_EXAGGERATION")
+        terrain_exaggeration_env = _first_env(
+            env,
+            "TRAILGEN_TERRAIN_EXAGGERATION",
+            "MAP_TERRAIN_EXAGGERATION",
+            "TERRAIN_EXAGGERATION",
         )
         terrain_exaggeration = (
             _parse_float(terrain_exaggeration_env, "terrain_exaggeration")
@@ -182,25 +228,25 @@ def load_app_config(
             else terrain_exaggeration
         )
 
-        max_zoom_env = os.getenv("TRAILGEN_MAX_ZOOM") or os.getenv("MAP_MAX_ZOOM")
+        max_zoom_env = _first_env(env, "TRAILGEN_MAX_ZOOM", "MAP_MAX_ZOOM")
         max_zoom = _parse_float(max_zoom_env, "max_zoom") if max_zoom_env else max_zoom
 
-        cache_dir = Path(os.getenv("TRAILGEN_CACHE_DIR", str(cache_dir))).expanduser()
-        cache_max_env = os.getenv("TRAILGEN_CACHE_MAX") or os.getenv(
-            "TRAILGEN_CACHE_MAX_BYTES"
+        cache_dir = Path(env.get("TRAILGEN_CACHE_DIR", str(cache_dir))).expanduser()
+        cache_max_env = _first_env(
+            env, "TRAILGEN_CACHE_MAX", "TRAILGEN_CACHE_MAX_BYTES"
         )
         if cache_max_env:
             cache_max_bytes = parse_size(cache_max_env, cache_max_bytes)
 
-        page_timeout_env = os.getenv("TRAILGEN_PAGE_TIMEOUT_MS")
+        page_timeout_env = env.get("TRAILGEN_PAGE_TIMEOUT_MS")
         if page_timeout_env:
             page_timeout_ms = _parse_float(page_timeout_env, "page_timeout_ms")
 
-        frame_timeout_env = os.getenv("TRAILGEN_FRAME_TIMEOUT_MS")
+        frame_timeout_env = env.get("TRAILGEN_FRAME_TIMEOUT_MS")
         if frame_timeout_env:
             frame_timeout_ms = _parse_float(frame_timeout_env, "frame_timeout_ms")
 
-        tile_timeout_env = os.getenv("TRAILGEN_TILE_TIMEOUT_S")
+        tile_timeout_env = env.get("TRAILGEN_TILE_TIMEOUT_S")
         if tile_timeout_env:
             tile_timeout_s = _parse_float(tile_timeout_env, "tile_timeout_s")
 
@@ -223,6 +269,8 @@ def load_app_config(
 
 def save_app_config(config: AppConfig, config_path: Path | None = None) -> Path:
     path = resolve_config_path(config_path)
+    import configparser
+
     path.parent.mkdir(parents=True, exist_ok=True)
     parser = configparser.ConfigParser()
     parser["default"] = {
@@ -246,15 +294,21 @@ def save_app_config(config: AppConfig, config_path: Path | None = None) -> Path:
         ),
         "tile_timeout_s": str(config.tile_timeout_s),
     }
-    buffer = io.StringIO()
-    parser.write(buffer)
-    content = buffer.getvalue()
-    if os.name == "posix":
-        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
-        with os.fdopen(fd, "w", encoding="utf-8") as handle:
-            handle.write(content)
-    else:
-        path.write_text(content, encoding="utf-8")
+    # Write next to the target and swap it in, so an interrupted save never
+    # leaves a truncated config behind.
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        if os.name == "posix":
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            handle = os.fdopen(fd, "w", encoding="utf-8")
+        else:
+            handle = tmp_path.open("w", encoding="utf-8")
+        with handle:
+            parser.write(handle)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
     return path
 
 
@@ -278,6 +332,9 @@ def _resolve_template(
     return template
 
 
+# AppConfig is frozen (hashable) and MapConfig is immutable, so equal app
+# configs can share one resolved map config.
+@functools.lru_cache(maxsize=8)
 def map_config(app_cfg: AppConfig) -> MapConfig:
     provider = (app_cfg.map_provider or DEFAULT_PROVIDER).lower()
     max_zoom = app_cfg.max_zoom
@@ -2,11 +2,16 @@ from .core import (
     EARTH_RADIUS_M,
     RoutePoint,
     bearing_deg,
+    bearings_deg,
     chaikin_smooth,
     cumulative_distances,
+    cumulative_distances_equirect,
     haversine_m,
     interpolate_along_route,
+    interpolate_columns,
+    interpolate_many,
     resample_by_distance,
+    route_columns,
     to_route_points,
 )
 from .gpx import GeoPoint, load_gpx
@@ -15,12 +20,17 @@ __all__ = [
     "EARTH_RADIUS_M",
     "RoutePoint",
     "bearing_deg",
+    "bearings_deg",
     "chaikin_smooth",
     "cumulative_distances",
+    "cumulative_distances_equirect",
     "GeoPoint",
     "haversine_m",
     "interpolate_along_route",
+    "interpolate_columns",
+    "interpolate_many",
     "load_gpx",
     "resample_by_distance",
+    "route_columns",
     "to_route_points",
 ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import math
 from dataclasses import dataclass
 from typing import Iterable
@@ -10,7 +11,7 @@ from .gpx import GeoPoint
 EARTH_RADIUS_M = 6371000.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RoutePoint:
     lat: float
     lon: float
@@ -63,6 +64,37 @@ def bearing_deg(a: RoutePoint, b: RoutePoint) -> float:
     return (bearing + 360.0) % 360.0
 
 
+def bearings_deg(
+    from_lats: list[float],
+    from_lons: list[float],
+    to_lats: list[float],
+    to_lons: list[float],
+) -> list[float]:
+    """
+    Batch version of bearing_deg over parallel coordinate lists, without
+    building a RoutePoint per endpoint.
+    Args:
+        from_lats: Latitudes of the starting points.
+        from_lons: Longitudes of the starting points.
+        to_lats: Latitudes of the destination points.
+        to_lons: Longitudes of the destination points.
+    Returns:
+        Bearings in degrees (0-360), one per pair.
+    """
+    bearings = []
+    for from_lat, from_lon, to_lat, to_lon in zip(
+        from_lats, from_lons, to_lats, to_lons
+    ):
+        lat1 = math.radians(from_lat)
+        lat2 = math.radians(to_lat)
+        dlon = math.radians(to_lon - from_lon)
+        cos_lat2 = math.cos(lat2)
+        y = math.sin(dlon) * cos_lat2
+        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * cos_lat2 * math.cos(dlon)
+        bearings.append((math.degrees(math.atan2(y, x)) + 360.0) % 360.0)
+    return bearings
+
+
 def to_route_points(points: Iterable[GeoPoint]) -> list[RoutePoint]:
     """
     Converts an iterable of GeoPoint objects to a list of RoutePoint objects.
@@ -79,6 +111,23 @@ def to_route_points(points: Iterable[GeoPoint]) -> list[RoutePoint]:
     return route
 
 
+def route_columns(
+    points: list[RoutePoint],
+) -> tuple[list[float], list[float], list[float]]:
+    """
+    Splits a list of RoutePoints into parallel latitude, longitude and
+    elevation lists, the layout the batch helpers in this module work on.
+    Args:
+        points: List of RoutePoint objects.
+    Returns:
+        Latitudes, longitudes and elevations, one entry per point.
+    """
+    lats = [p.lat for p in points]
+    lons = [p.lon for p in points]
+    eles = [p.ele for p in points]
+    return lats, lons, eles
+
+
 def cumulative_distances(points: list[RoutePoint]) -> list[float]:
     """
     Computes cumulative distances (in meters) along a list of RoutePoints.
@@ -87,9 +136,47 @@ def cumulative_distances(points: list[RoutePoint]) -> list[float]:
     Returns:
         List of cumulative distances, starting with 0.0.
     """
+    # Same formula as haversine_m, but each point is converted to radians and
+    # its latitude cosine taken once, rather than once per segment it ends.
+    lats = [math.radians(p.lat) for p in points]
+    lons = [math.radians(p.lon) for p in points]
+    cos_lats = [math.cos(lat) for lat in lats]
     distances = [0.0]
+    total = 0.0
     for idx in range(1, len(points)):
-        distances.append(distances[-1] + haversine_m(points[idx - 1], points[idx]))
+        prev = idx - 1
+        dlat = lats[idx] - lats[prev]
+        dlon = lons[idx] - lons[prev]
+        h = (
+            math.sin(dlat / 2) ** 2
+            + cos_lats[prev] * cos_lats[idx] * math.sin(dlon / 2) ** 2
+        )
+        total += 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
+        distances.append(total)
+    return distances
+
+
+def cumulative_distances_equirect(points: list[RoutePoint]) -> list[float]:
+    """
+    Faster variant of cumulative_distances using the equirectangular
+    approximation. Only meant for routes whose segments are short (well under
+    a kilometer, e.g. after resample_by_distance), where its difference from
+    the haversine result is far below GPS noise.
+    Args:
+        points: List of RoutePoint objects.
+    Returns:
+        List of cumulative distances, starting with 0.0.
+    """
+    lats = [math.radians(p.lat) for p in points]
+    lons = [math.radians(p.lon) for p in points]
+    distances = [0.0]
+    total = 0.0
+    for idx in range(1, len(points)):
+        prev = idx - 1
+        x = (lons[idx] - lons[prev]) * math.cos((lats[idx] + lats[prev]) / 2)
+        y = lats[idx] - lats[prev]
+        total += EARTH_RADIUS_M * math.hypot(x, y)
+        distances.append(total)
     return distances
 
 
@@ -116,9 +203,10 @@ def resample_by_distance(points: list[RoutePoint], step_m: float) -> list[RouteP
     target = step_m
     idx = 1
 
-    while target < total and idx < len(points):
-        while idx < len(points) and distances[idx] < target:
-            idx += 1
+    while target < total:
+        # Distances never decrease, so the bracketing segment for the next
+        # target is found by bisecting from the current one.
+        idx = bisect.bisect_left(distances, target, idx)
         if idx >= len(points):
             break
 
@@ -150,30 +238,33 @@ def chaikin_smooth(points: list[RoutePoint], iterations: int = 2) -> list[RouteP
     Returns:
         Smoothed list of RoutePoint objects.
     """
-    if len(points) < 3:
+    if len(points) < 3 or iterations <= 0:
         return points
 
-    current = points
+    # Cut corners on plain coordinate lists and only build RoutePoints for the
+    # final iteration, instead of two fresh points per segment per iteration.
+    lats, lons, eles = route_columns(points)
     for _ in range(iterations):
-        next_points: list[RoutePoint] = [current[0]]
-        for idx in range(len(current) - 1):
-            p0 = current[idx]
-            p1 = current[idx + 1]
-            q = RoutePoint(
-                lat=0.75 * p0.lat + 0.25 * p1.lat,
-                lon=0.75 * p0.lon + 0.25 * p1.lon,
-                ele=0.75 * p0.ele + 0.25 * p1.ele,
-            )
-            r = RoutePoint(
-                lat=0.25 * p0.lat + 0.75 * p1.lat,
-                lon=0.25 * p0.lon + 0.75 * p1.lon,
-                ele=0.25 * p0.ele + 0.75 * p1.ele,
-            )
-            next_points.extend([q, r])
-        next_points.append(current[-1])
-        current = next_points
-
-    return current
+        lats = _chaikin_column(lats)
+        lons = _chaikin_column(lons)
+        eles = _chaikin_column(eles)
+
+    last = len(lats) - 1
+    smoothed = [points[0]]
+    smoothed.extend(
+        RoutePoint(lats[idx], lons[idx], eles[idx]) for idx in range(1, last)
+    )
+    smoothed.append(points[-1])
+    return smoothed
+
+
+def _chaikin_column(values: list[float]) -> list[float]:
+    out = [values[0]]
+    for a, b in zip(values, values[1:]):
+        out.append(0.75 * a + 0.25 * b)
+        out.append(0.25 * a + 0.75 * b)
+    out.append(values[-1])
+    return out
 
 
 def interpolate_along_route(
@@ -194,9 +285,7 @@ def interpolate_along_route(
     if target_m >= distances[-1]:
         return points[-1]
 
-    idx = 1
-    while idx < len(distances) and distances[idx] < target_m:
-        idx += 1
+    idx = bisect.bisect_left(distances, target_m, 1)
 
     prev = points[idx - 1]
     curr = points[idx]
@@ -210,3 +299,75 @@ def interpolate_along_route(
     lon = prev.lon + ratio * (curr.lon - prev.lon)
     ele = prev.ele + ratio * (curr.ele - prev.ele)
     return RoutePoint(lat, lon, ele)
+
+
+def interpolate_many(
+    points: list[RoutePoint], distances: list[float], targets_m: Iterable[float]
+) -> list[RoutePoint]:
+    """
+    Batch version of interpolate_along_route. Ascending targets are resolved
+    in a single forward walk over the route instead of one scan per target.
+    Args:
+        points: List of RoutePoint objects.
+        distances: List of cumulative distances corresponding to points.
+        targets_m: Target distances along the route in meters.
+    Returns:
+        Interpolated RoutePoints, one per target.
+    """
+    lats, lons, eles = interpolate_columns(*route_columns(points), distances, targets_m)
+    return [RoutePoint(lat, lon, ele) for lat, lon, ele in zip(lats, lons, eles)]
+
+
+def interpolate_columns(
+    lats: list[float],
+    lons: list[float],
+    eles: list[float],
+    distances: list[float],
+    targets_m: Iterable[float],
+) -> tuple[list[float], list[float], list[float]]:
+    """
+    Same as interpolate_many, but the route and the result are given as
+    parallel lat/lon/ele lists, so hot loops can skip RoutePoint objects.
+    Args:
+        lats: Route latitudes.
+        lons: Route longitudes.
+        eles: Route elevations.
+        distances: List of cumulative distances corresponding to the route.
+        targets_m: Target distances along the route in meters.
+    Returns:
+        Interpolated latitudes, longitudes and elevations, one per target.
+    """
+    total = distances[-1]
+    last = len(distances) - 1
+    out_lats: list[float] = []
+    out_lons: list[float] = []
+    out_eles: list[float] = []
+    idx = 1
+    for target_m in targets_m:
+        if target_m <= 0:
+            out_lats.append(lats[0])
+            out_lons.append(lons[0])
+            out_eles.append(eles[0])
+            continue
+        if target_m >= total:
+            out_lats.append(lats[-1])
+            out_lons.append(lons[-1])
+            out_eles.append(eles[-1])
+            continue
+
+        if distances[idx - 1] >= target_m:
+            idx = 1
+        while idx < last and distances[idx] < target_m:
+            idx += 1
+
+        prev = idx - 1
+        span = distances[idx] - distances[prev]
+        if span == 0:
+            ratio = 0.0
+        else:
+            ratio = (target_m - distances[prev]) / span
+
+        out_lats.append(lats[prev] + ratio * (lats[idx] - lats[prev]))
+        out_lons.append(lons[prev] + ratio * (lons[idx] - lons[prev]))
+        out_eles.append(eles[prev] + ratio * (eles[idx] - eles[prev]))
+    return out_lats, out_lons, out_eles
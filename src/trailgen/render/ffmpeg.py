@@ -20,10 +20,11 @@ def encode_video(
     fps: int,
     crf: int,
     preset: str,
+    frame_ext: str = "png",
 ) -> None:
     ensure_ffmpeg()
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    pattern = str(frames_dir / "frame_%06d.png")
+    pattern = str(frames_dir / f"frame_%06d.{frame_ext}")
 
     cmd = [
         "ffmpeg",
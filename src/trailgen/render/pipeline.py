@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import math
+import os
 import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from importlib import resources
 from dataclasses import dataclass
 from pathlib import Path
@@ -24,19 +29,20 @@ from trailgen.camera import (
     FollowCameraConfig,
     build_follow_camera_frames,
 )
-from trailgen.config import MapConfig, load_app_config, map_config
+from trailgen.config import AppConfig, MapConfig, load_app_config, map_config
 from trailgen.geo import (
     RoutePoint,
     chaikin_smooth,
-    cumulative_distances,
+    cumulative_distances_equirect,
     resample_by_distance,
+    route_columns,
     to_route_points,
 )
 from trailgen.geo import load_gpx
 from trailgen.terrain import TerrainSampler, select_dem_zoom
 
 from .ffmpeg import FFmpegError, encode_video
-from .server import RendererServer
+from .server import RendererServer, TileCacheIndex
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +134,233 @@ def _build_renderer_config(
     }
 
 
+def _build_cameras(
+    options: RenderOptions,
+    app_cfg: AppConfig,
+    map_cfg: MapConfig,
+    route_points: list[RoutePoint],
+    distances: list[float],
+    total_distance: float,
+    total_frames: int,
+    intro_frames: int,
+    outro_frames: int,
+    camera_mode: str,
+    auto_params: dict[str, float],
+    dem_zoom_bias: int,
+    cache_index: TileCacheIndex,
+    cancel: threading.Event,
+) -> list[FreeCameraFrame]:
+    lats, lons, elevations = route_columns(route_points)
+    avg_lat = sum(lats) / len(lats)
+    base_dem_zoom = select_dem_zoom(avg_lat)
+    dem_zoom = max(8, min(14, base_dem_zoom + dem_zoom_bias))
+    terrain = TerrainSampler(
+        map_cfg.terrain_tiles,
+        map_cfg.terrain_encoding or "mapbox",
+        cache_dir=app_cfg.cache_dir,
+        zoom=dem_zoom,
+        exaggeration=map_cfg.terrain_exaggeration or 1.0,
+        timeout_s=app_cfg.tile_timeout_s,
+        on_cache_write=cache_index.record_write,
+        cancel=cancel,
+    )
+
+    if max(elevations) - min(elevations) < 5.0:
+        heights = terrain.height_at_many(lons, lats)
+        elevations = [
+            ele if height is None else height
+            for height, ele in zip(heights, elevations)
+        ]
+        route_points = [
+            RoutePoint(lat, lon, ele) for lat, lon, ele in zip(lats, lons, elevations)
+        ]
+
+    summit_idx = elevations.index(max(elevations))
+    summit_distance = distances[summit_idx]
+
+    if camera_mode == "auto":
+        lookahead_m = (
+            options.lookahead_m
+            if options.lookahead_m is not None
+            else auto_params["lookahead_m"]
+        )
+        auto_cfg = AutoCameraConfig(
+            fps=options.fps,
+            intro_frames=intro_frames,
+            outro_frames=outro_frames,
+            total_frames=total_frames,
+            lookahead_m=lookahead_m,
+            side_offset_m=auto_params["side_offset_m"],
+            back_offset_m=auto_params["back_offset_m"],
+            base_clearance_m=auto_params["base_clearance_m"],
+            relief_factor=auto_params["relief_factor"],
+            summit_boost_m=auto_params["summit_boost_m"],
+            relief_window_m=auto_params["relief_window_m"],
+            summit_sigma_m=auto_params["summit_sigma_m"],
+        )
+        return build_auto_camera_frames(
+            route_points,
+            distances,
+            total_distance,
+            auto_cfg,
+            terrain,
+            summit_distance,
+            elevations,
+        )
+    else:
+        follow_cfg = FollowCameraConfig(
+            fps=options.fps,
+            intro_frames=intro_frames,
+            outro_frames=outro_frames,
+            total_frames=total_frames,
+            distance_m=options.follow_distance_m,
+            pitch_deg=options.follow_pitch_deg,
+            lookahead_m=options.follow_lookahead_m,
+            bearing_sensitivity=options.follow_bearing_sensitivity,
+            panning_sensitivity=options.follow_panning_sensitivity,
+            smoothing_s=options.follow_smoothing_s,
+            min_clearance_m=options.follow_min_clearance_m,
+        )
+        return build_follow_camera_frames(
+            route_points,
+            distances,
+            total_distance,
+            follow_cfg,
+            terrain,
+        )
+
+
+_BROWSER_ARGS = [
+    "--use-gl=swiftshader",
+    "--enable-webgl",
+    "--ignore-gpu-blocklist",
+]
+_MAX_RENDER_WORKERS = 4
+# Total device pixels all render workers may hold at once, about four 1080p
+# pages; larger viewports get fewer parallel browsers.
+_RENDER_PIXEL_BUDGET = 4 * 1920 * 1080
+_FRAME_EXTENSIONS = {"png": "png", "jpeg": "jpg"}
+_JPEG_QUALITY = 92
+# Frames a render worker may have queued for writing before it waits for the
+# oldest one, so a slow disk throttles rendering instead of filling memory.
+_MAX_PENDING_WRITES = 8
+
+
+def _render_worker_count(
+    options: RenderOptions, device_scale_factor: float, frame_count: int
+) -> int:
+    pixels = options.width * options.height * device_scale_factor**2
+    by_pixels = int(_RENDER_PIXEL_BUDGET // max(1.0, pixels))
+    by_cpu = (os.cpu_count() or 2) // 2
+    return max(1, min(_MAX_RENDER_WORKERS, by_cpu, by_pixels, frame_count))
+
+
+def _log_request_failed(request) -> None:
+    failure = request.failure
+    error_text = None
+    try:
+        if callable(failure):
+            info = failure()
+            if isinstance(info, dict):
+                error_text = info.get("errorText")
+        elif isinstance(failure, dict):
+            error_text = failure.get("errorText")
+        else:
+            error_text = getattr(failure, "error_text", None)
+    except Exception:
+        error_text = None
+
+    if not error_text:
+        error_text = "request failed"
+    logger.debug("[request failed] %s %s", error_text, request.url)
+
+
+def _open_renderer_page(
+    playwright,
+    options: RenderOptions,
+    renderer_cfg: dict,
+    route_json: str,
+    base_url: str,
+    device_scale_factor: float,
+    page_timeout_ms: int,
+):
+    browser = playwright.chromium.launch(args=_BROWSER_ARGS)
+    page = browser.new_page(
+        viewport={"width": options.width, "height": options.height},
+        device_scale_factor=device_scale_factor,
+    )
+    page.set_default_timeout(page_timeout_ms)
+    if logger.isEnabledFor(logging.DEBUG):
+        page.on(
+            "console",
+            lambda msg: logger.debug("[browser %s] %s", msg.type, msg.text),
+        )
+        page.on("pageerror", lambda err: logger.debug("[browser error] %s", err))
+        page.on("requestfailed", _log_request_failed)
+    page.add_init_script(f"window.__CONFIG__ = {json.dumps(renderer_cfg)};")
+    page.goto(f"{base_url}/index.html", wait_until="load")
+    page.wait_for_function("window.__READY__ === true || window.__READY__ === 'error'")
+    ready_state = page.evaluate("window.__READY__")
+    if not ready_state:
+        error_message = (
+            page.evaluate("window.__ERROR__") or "Renderer failed to initialize."
+        )
+        raise RuntimeError(error_message)
+
+    # Playwright serializes evaluate() arguments value by value in Python; one
+    # JSON string is far cheaper for long routes.
+    page.evaluate("data => window.__setRoute(JSON.parse(data))", route_json)
+    page.wait_for_function("window.__ROUTE_READY__ === true")
+    return browser, page
+
+
+def _warm_up_page(page, camera: FreeCameraFrame) -> None:
+    # A fresh page has no tiles loaded yet; settling on the shard's first view
+    # keeps that cold load out of the frames the "render" wait captures.
+    page.evaluate(
+        "([data, wait]) => window.__renderFrame(data, wait)",
+        [camera.__dict__, "idle"],
+    )
+
+
+def _render_frames(
+    page,
+    cameras: list[FreeCameraFrame],
+    first: int,
+    last: int,
+    frames_dir: Path,
+    frame_format: str,
+    device_scale_factor: float,
+    frame_writer: ThreadPoolExecutor,
+    advance,
+    stop: threading.Event,
+) -> list[Future]:
+    frame_ext = _FRAME_EXTENSIONS[frame_format]
+    screenshot_kwargs = {"type": frame_format}
+    if frame_format == "jpeg":
+        screenshot_kwargs["quality"] = _JPEG_QUALITY
+    if device_scale_factor > 1.0:
+        screenshot_kwargs["scale"] = "css"
+    # Screenshots come back as bytes and are saved on a worker thread, so the
+    # next frame starts rendering while the previous one is written to disk.
+    writes: deque[Future] = deque()
+    for idx in range(first, last):
+        if stop.is_set():
+            break
+        page.evaluate("data => window.__renderFrame(data)", cameras[idx].__dict__)
+        try:
+            image = page.screenshot(**screenshot_kwargs)
+        except TypeError:
+            screenshot_kwargs.pop("scale", None)
+            image = page.screenshot(**screenshot_kwargs)
+        frame_path = frames_dir / f"frame_{idx + 1:06d}.{frame_ext}"
+        writes.append(frame_writer.submit(frame_path.write_bytes, image))
+        if len(writes) > _MAX_PENDING_WRITES:
+            writes.popleft().result()
+        advance()
+    return list(writes)
+
+
 def render_video(options: RenderOptions) -> None:
     points = load_gpx(options.gpx_path)
     route_points = to_route_points(points)
@@ -138,7 +371,9 @@ def render_video(options: RenderOptions) -> None:
     if len(route_points) < 2:
         raise ValueError("Route must contain at least two distinct points.")
 
-    distances = cumulative_distances(route_points)
+    # Segments are at most one resampling step long here, short enough for the
+    # equirectangular approximation.
+    distances = cumulative_distances_equirect(route_points)
     total_distance = distances[-1]
     if total_distance <= 0:
         raise ValueError("Route distance is zero.")
@@ -192,12 +427,17 @@ def render_video(options: RenderOptions) -> None:
         frame_wait = "render"
         frame_delay_ms = 150
         frame_timeout_ms = app_cfg.frame_timeout_ms or 6000
+        # High-quality JPEG is much cheaper to encode and write than PNG and
+        # is indistinguishable once re-encoded to H.264.
+        frame_format = "jpeg"
     else:
         max_zoom = base_max_zoom
         frame_wait = "idle"
         frame_delay_ms = 0
         frame_timeout_ms = app_cfg.frame_timeout_ms or 20000
         device_scale_factor = 2.0
+        frame_format = "png"
+    frame_ext = _FRAME_EXTENSIONS[frame_format]
 
     initial_zoom = max(2.0, min(max_zoom, 12.0 + math.log2(scale)))
     initial_pitch = 60.0
@@ -217,95 +457,39 @@ def render_video(options: RenderOptions) -> None:
     renderer_cfg["initialZoom"] = initial_zoom
 
     cache_dir = app_cfg.cache_dir
+    # Shared by the tile proxy and the camera's DEM sampler, which write into
+    # the same cache, so the size limit covers both.
+    cache_index = TileCacheIndex(cache_dir, app_cfg.cache_max_bytes)
 
-    cameras: list[FreeCameraFrame] = []
-    if map_cfg.terrain_tiles:
-        avg_lat = sum(p.lat for p in route_points) / len(route_points)
-        base_dem_zoom = select_dem_zoom(avg_lat)
-        dem_zoom = max(8, min(14, base_dem_zoom + dem_zoom_bias))
-        terrain = TerrainSampler(
-            map_cfg.terrain_tiles,
-            map_cfg.terrain_encoding or "mapbox",
-            cache_dir=cache_dir,
-            zoom=dem_zoom,
-            exaggeration=map_cfg.terrain_exaggeration or 1.0,
-            timeout_s=app_cfg.tile_timeout_s,
-        )
-
-        elevations = [p.ele for p in route_points]
-        if max(elevations) - min(elevations) < 5.0:
-            sampled = []
-            for pt in route_points:
-                height = terrain.height_at(pt.lon, pt.lat)
-                sampled.append(height if height is not None else pt.ele)
-            elevations = sampled
-            route_points = [
-                RoutePoint(pt.lat, pt.lon, elevations[idx])
-                for idx, pt in enumerate(route_points)
-            ]
-
-        summit_idx = max(range(len(elevations)), key=lambda idx: elevations[idx])
-        summit_distance = distances[summit_idx]
-
-        if camera_mode == "auto":
-            lookahead_m = (
-                options.lookahead_m
-                if options.lookahead_m is not None
-                else auto_params["lookahead_m"]
-            )
-            auto_cfg = AutoCameraConfig(
-                fps=options.fps,
-                intro_frames=intro_frames,
-                outro_frames=outro_frames,
-                total_frames=total_frames,
-                lookahead_m=lookahead_m,
-                side_offset_m=auto_params["side_offset_m"],
-                back_offset_m=auto_params["back_offset_m"],
-                base_clearance_m=auto_params["base_clearance_m"],
-                relief_factor=auto_params["relief_factor"],
-                summit_boost_m=auto_params["summit_boost_m"],
-                relief_window_m=auto_params["relief_window_m"],
-                summit_sigma_m=auto_params["summit_sigma_m"],
-            )
-            cameras = build_auto_camera_frames(
-                route_points,
-                distances,
-                total_distance,
-                auto_cfg,
-                terrain,
-                summit_distance,
-                elevations,
-            )
-        else:
-            follow_cfg = FollowCameraConfig(
-                fps=options.fps,
-                intro_frames=intro_frames,
-                outro_frames=outro_frames,
-                total_frames=total_frames,
-                distance_m=options.follow_distance_m,
-                pitch_deg=options.follow_pitch_deg,
-                lookahead_m=options.follow_lookahead_m,
-                bearing_sensitivity=options.follow_bearing_sensitivity,
-                panning_sensitivity=options.follow_panning_sensitivity,
-                smoothing_s=options.follow_smoothing_s,
-                min_clearance_m=options.follow_min_clearance_m,
-            )
-            cameras = build_follow_camera_frames(
-                route_points,
-                distances,
-                total_distance,
-                follow_cfg,
-                terrain,
-            )
-    else:
+    if not map_cfg.terrain_tiles:
         raise RuntimeError("Terrain tiles are required for camera rendering.")
 
     frames_dir = _ensure_frames_dir(options.frames_dir)
     cleanup_frames = not options.keep_frames and options.frames_dir is None
 
-    logger.info("Rendering %s frames to %s...", total_frames, frames_dir)
+    # Camera planning only needs the route and the DEM, so run it in the
+    # background while the tile proxy and browser start and load the style.
+    camera_cancel = threading.Event()
+    camera_executor = ThreadPoolExecutor(max_workers=1)
+    camera_future = camera_executor.submit(
+        _build_cameras,
+        options,
+        app_cfg,
+        map_cfg,
+        route_points,
+        distances,
+        total_distance,
+        total_frames,
+        intro_frames,
+        outro_frames,
+        camera_mode,
+        auto_params,
+        dem_zoom_bias,
+        cache_index,
+        camera_cancel,
+    )
 
-    debug = logger.isEnabledFor(logging.DEBUG)
+    logger.info("Rendering %s frames to %s...", total_frames, frames_dir)
 
     try:
         with resources.as_file(resources.files("trailgen.renderer")) as renderer_dir:
@@ -316,76 +500,32 @@ def render_video(options: RenderOptions) -> None:
                 cache_dir=cache_dir,
                 cache_max_bytes=app_cfg.cache_max_bytes,
                 tile_timeout_s=app_cfg.tile_timeout_s,
+                cache_index=cache_index,
             ) as server:
                 if server.raster_url_template:
                     renderer_cfg["rasterTiles"] = server.raster_url_template
                 if server.terrain_url_template:
                     renderer_cfg["terrainTiles"] = server.terrain_url_template
 
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(
-                        args=[
-                            "--use-gl=swiftshader",
-                            "--enable-webgl",
-                            "--ignore-gpu-blocklist",
-                        ]
-                    )
-                    page = browser.new_page(
-                        viewport={"width": options.width, "height": options.height},
-                        device_scale_factor=device_scale_factor,
-                    )
-                    page.set_default_timeout(app_cfg.page_timeout_ms)
-                    if debug:
-                        page.on(
-                            "console",
-                            lambda msg: logger.debug(
-                                "[browser %s] %s", msg.type, msg.text
-                            ),
-                        )
-                        page.on(
-                            "pageerror",
-                            lambda err: logger.debug("[browser error] %s", err),
-                        )
-
-                        def log_request_failed(request) -> None:
-                            failure = request.failure
-                            error_text = None
-                            try:
-                                if callable(failure):
-                                    info = failure()
-                                    if isinstance(info, dict):
-                                        error_text = info.get("errorText")
-                                elif isinstance(failure, dict):
-                                    error_text = failure.get("errorText")
-                                else:
-                                    error_text = getattr(failure, "error_text", None)
-                            except Exception:
-                                error_text = None
-
-                            if not error_text:
-                                error_text = "request failed"
-                            logger.debug(
-                                "[request failed] %s %s", error_text, request.url
-                            )
+                route_json = json.dumps(route_geojson)
+                open_page = functools.partial(
+                    _open_renderer_page,
+                    options=options,
+                    renderer_cfg=renderer_cfg,
+                    route_json=route_json,
+                    base_url=server.base_url,
+                    device_scale_factor=device_scale_factor,
+                    page_timeout_ms=app_cfg.page_timeout_ms,
+                )
 
-                        page.on("requestfailed", log_request_failed)
-                    page.add_init_script(
-                        f"window.__CONFIG__ = {json.dumps(renderer_cfg)};"
-                    )
-                    page.goto(f"{server.base_url}/index.html", wait_until="load")
-                    page.wait_for_function(
-                        "window.__READY__ === true || window.__READY__ === 'error'"
+                with sync_playwright() as p:
+                    browser, page = open_page(p)
+                    cameras = camera_future.result()
+                    workers = _render_worker_count(
+                        options, device_scale_factor, len(cameras)
                     )
-                    ready_state = page.evaluate("window.__READY__")
-                    if not ready_state:
-                        error_message = (
-                            page.evaluate("window.__ERROR__")
-                            or "Renderer failed to initialize."
-                        )
-                        raise RuntimeError(error_message)
-
-                    page.evaluate("data => window.__setRoute(data)", route_geojson)
-                    page.wait_for_function("window.__ROUTE_READY__ === true")
+                    shard_size = -(-len(cameras) // workers)
+                    stop = threading.Event()
 
                     with Progress(
                         TextColumn("[progress.description]{task.description}"),
@@ -399,35 +539,85 @@ def render_video(options: RenderOptions) -> None:
                         task_id = progress.add_task(
                             "Rendering frames", total=total_frames
                         )
-                        for idx, cam in enumerate(cameras, start=1):
-                            page.evaluate(
-                                "data => window.__renderFrame(data)", cam.__dict__
+
+                        def render_shard(shard_page, first: int) -> list[Future]:
+                            return _render_frames(
+                                shard_page,
+                                cameras,
+                                first,
+                                min(len(cameras), first + shard_size),
+                                frames_dir,
+                                frame_format,
+                                device_scale_factor,
+                                frame_writer,
+                                lambda: progress.update(task_id, advance=1),
+                                stop,
                             )
-                            frame_path = frames_dir / f"frame_{idx:06d}.png"
-                            screenshot_kwargs = {"path": str(frame_path)}
-                            if device_scale_factor > 1.0:
-                                screenshot_kwargs["scale"] = "css"
+
+                        # Playwright objects are tied to the thread that made
+                        # them, so each extra worker drives its own browser.
+                        def render_in_worker(first: int) -> list[Future]:
+                            with sync_playwright() as worker_playwright:
+                                worker_browser, worker_page = open_page(
+                                    worker_playwright
+                                )
+                                try:
+                                    _warm_up_page(worker_page, cameras[first])
+                                    return render_shard(worker_page, first)
+                                except BaseException:
+                                    stop.set()
+                                    raise
+                                finally:
+                                    worker_browser.close()
+
+                        # Frames are independent camera jumps, so extra
+                        # browsers render later slices of the video while this
+                        # page renders the first one.
+                        with (
+                            ThreadPoolExecutor(max_workers=workers) as frame_writer,
+                            ThreadPoolExecutor(max_workers=workers) as shard_pool,
+                        ):
+                            shards = [
+                                shard_pool.submit(render_in_worker, first)
+                                for first in range(shard_size, len(cameras), shard_size)
+                            ]
                             try:
-                                page.screenshot(**screenshot_kwargs)
-                            except TypeError:
-                                screenshot_kwargs.pop("scale", None)
-                                page.screenshot(**screenshot_kwargs)
-                            progress.update(task_id, advance=1)
+                                writes = render_shard(page, 0)
+                                for shard in shards:
+                                    writes.extend(shard.result())
+                            except BaseException:
+                                stop.set()
+                                raise
+                        for write in writes:
+                            write.result()
 
                     browser.close()
 
         logger.info("Encoding video...")
         try:
             encode_video(
-                frames_dir, options.out_path, options.fps, options.crf, options.preset
+                frames_dir,
+                options.out_path,
+                options.fps,
+                options.crf,
+                options.preset,
+                frame_ext=frame_ext,
             )
         except FFmpegError as exc:
             raise RuntimeError(str(exc)) from exc
 
         logger.info("Done: %s", options.out_path)
+    except BaseException:
+        # The executor's thread is joined at exit either way, so tell the
+        # camera plan to stop fetching DEM tiles nobody will use.
+        camera_cancel.set()
+        camera_executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    else:
+        camera_executor.shutdown()
     finally:
         if cleanup_frames:
-            for frame in frames_dir.glob("frame_*.png"):
+            for frame in frames_dir.glob(f"frame_*.{frame_ext}"):
                 frame.unlink(missing_ok=True)
             try:
                 frames_dir.rmdir()
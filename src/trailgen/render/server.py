@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import heapq
 import logging
 import mimetypes
 import os
+import stat
 import time
 import threading
 import urllib.error
@@ -12,9 +14,86 @@ from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+from trailgen.terrain import write_cache_file
+
 logger = logging.getLogger(__name__)
 
 
+# Size index of the on-disk tile cache, built once and then updated on every
+# write, so enforcing the size limit does not rescan the directory. The tile
+# proxy and the DEM sampler share one index because they write the same cache.
+class TileCacheIndex:
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        # One heap entry per indexed file, ordered by mtime. Cache hits touch
+        # files without going through the index, so entries are re-checked
+        # against the file when popped.
+        self._lock = threading.Lock()
+        self._sizes: dict[Path, int] = {}
+        self._heap: list[tuple[float, Path]] = []
+        self._total = 0
+
+    def scan(self) -> None:
+        # Hold the lock for the whole walk so writes recorded meanwhile are
+        # not lost when the index is replaced.
+        with self._lock:
+            sizes: dict[Path, int] = {}
+            heap: list[tuple[float, Path]] = []
+            try:
+                for path in self._cache_dir.rglob("*"):
+                    try:
+                        info = path.stat()
+                    except OSError:
+                        continue
+                    if not stat.S_ISREG(info.st_mode):
+                        continue
+                    sizes[path] = info.st_size
+                    heap.append((info.st_mtime, path))
+            except OSError:
+                pass
+            heapq.heapify(heap)
+            self._sizes = sizes
+            self._heap = heap
+            self._total = sum(sizes.values())
+            self._evict()
+
+    def record_write(self, path: Path, size: int) -> None:
+        with self._lock:
+            previous = self._sizes.get(path)
+            self._sizes[path] = size
+            if previous is None:
+                self._total += size
+                heapq.heappush(self._heap, (time.time(), path))
+            else:
+                # Already queued; the newer mtime is picked up on pop.
+                self._total += size - previous
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._total > self._max_bytes and self._heap:
+            mtime, path = heapq.heappop(self._heap)
+            size = self._sizes.get(path)
+            if size is None:
+                continue
+            try:
+                current_mtime = path.stat().st_mtime
+            except OSError:
+                current_mtime = None
+            if current_mtime is not None and current_mtime > mtime:
+                # Touched or rewritten since it was queued; requeue it.
+                heapq.heappush(self._heap, (current_mtime, path))
+                continue
+            # Forget the entry even if it cannot be removed; it has no heap
+            # entry left and the next scan counts it again.
+            del self._sizes[path]
+            self._total -= size
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+
+
 class RendererServer:
     def __init__(
         self,
@@ -24,12 +103,13 @@ class RendererServer:
         cache_dir: Path,
         cache_max_bytes: int,
         tile_timeout_s: float,
+        cache_index: TileCacheIndex | None = None,
     ):
         self._renderer_dir = renderer_dir
         self._raster_upstream = raster_upstream
         self._terrain_upstream = terrain_upstream
         self._cache_dir = cache_dir
-        self._cache_max_bytes = cache_max_bytes
+        self._cache_index = cache_index or TileCacheIndex(cache_dir, cache_max_bytes)
         self._tile_timeout_s = tile_timeout_s
         self._raster_ext = (
             self._infer_extension(raster_upstream) if raster_upstream else "png"
@@ -40,6 +120,7 @@ class RendererServer:
         self._httpd: ThreadingHTTPServer | None = None
         self._thread: threading.Thread | None = None
         self.port: int | None = None
+        self._static: dict[str, tuple[bytes, str]] = {}
 
     @property
     def base_url(self) -> str:
@@ -70,6 +151,8 @@ class RendererServer:
         if self._httpd is not None:
             return
 
+        self._cache_index.scan()
+        self._static = self._load_static()
         handler = self._make_handler()
         self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
         self.port = self._httpd.server_address[1]
@@ -87,11 +170,11 @@ class RendererServer:
         self._thread = None
 
     def _make_handler(self):
-        renderer_dir = self._renderer_dir
+        static = self._static
         raster_upstream = self._raster_upstream
         terrain_upstream = self._terrain_upstream
         cache_dir = self._cache_dir
-        cache_max_bytes = self._cache_max_bytes
+        record_cache_write = self._cache_index.record_write
         tile_timeout_s = self._tile_timeout_s
 
         class Handler(BaseHTTPRequestHandler):
@@ -108,22 +191,12 @@ class RendererServer:
 
                 if path == "/":
                     path = "/index.html"
-                file_path = (renderer_dir / path.lstrip("/")).resolve()
-                if not file_path.is_file() or renderer_dir not in file_path.parents:
+                asset = static.get(path)
+                if asset is None:
                     self.send_error(HTTPStatus.NOT_FOUND, "Not found")
                     return
 
-                content_type = (
-                    mimetypes.guess_type(str(file_path))[0]
-                    or "application/octet-stream"
-                )
-                try:
-                    data = file_path.read_bytes()
-                except OSError:
-                    self.send_error(
-                        HTTPStatus.INTERNAL_SERVER_ERROR, "Failed to read file"
-                    )
-                    return
+                data, content_type = asset
 
                 self.send_response(HTTPStatus.OK)
                 self.send_header("Content-Type", content_type)
@@ -151,24 +224,38 @@ class RendererServer:
                 ext = y_part.split(".")[-1] if "." in y_part else "png"
 
                 cache_path = cache_dir / parts[1] / z / x / f"{y}.{ext}"
-                if cache_path.is_file():
-                    try:
-                        data = cache_path.read_bytes()
-                        content_type = (
-                            mimetypes.guess_type(str(cache_path))[0]
-                            or "application/octet-stream"
-                        )
-                        now = time.time()
-                        os.utime(cache_path, (now, now))
-                        self.send_response(HTTPStatus.OK)
-                        self.send_header("Content-Type", content_type)
-                        self.send_header("Access-Control-Allow-Origin", "*")
-                        self.send_header("Content-Length", str(len(data)))
-                        self.end_headers()
-                        self.wfile.write(data)
-                        return
-                    except OSError:
-                        pass
+                try:
+                    cached = cache_path.open("rb")
+                except OSError:
+                    cached = None
+                if cached is not None:
+                    with cached:
+                        try:
+                            size = os.fstat(cached.fileno()).st_size
+                        except OSError:
+                            size = None
+                        if size is not None:
+                            content_type = (
+                                mimetypes.guess_type(str(cache_path))[0]
+                                or "application/octet-stream"
+                            )
+                            # The touch only feeds LRU ordering; a file evicted
+                            # meanwhile or a read-only cache must not fail the
+                            # request.
+                            now = time.time()
+                            try:
+                                os.utime(cache_path, (now, now))
+                            except OSError:
+                                pass
+                            self.send_response(HTTPStatus.OK)
+                            self.send_header("Content-Type", content_type)
+                            self.send_header("Access-Control-Allow-Origin", "*")
+                            self.send_header("Content-Length", str(size))
+                            self.end_headers()
+                            # Kernel-side copy where the platform supports it;
+                            # socket.sendfile falls back to send() elsewhere.
+                            self.connection.sendfile(cached)
+                            return
 
                 target = upstream.format(z=z, x=x, y=y)
                 if query:
@@ -200,9 +287,8 @@ class RendererServer:
                     return
 
                 try:
-                    cache_path.parent.mkdir(parents=True, exist_ok=True)
-                    cache_path.write_bytes(payload)
-                    RendererServer._enforce_cache_limit(cache_dir, cache_max_bytes)
+                    write_cache_file(cache_path, payload)
+                    record_cache_write(cache_path, len(payload))
                 except OSError:
                     pass
 
@@ -223,29 +309,16 @@ class RendererServer:
             return suffix.lstrip(".")
         return "png"
 
-    @staticmethod
-    def _enforce_cache_limit(cache_dir: Path, max_bytes: int) -> None:
-        try:
-            entries = []
-            total = 0
-            for path in cache_dir.rglob("*"):
-                if not path.is_file():
-                    continue
-                stat = path.stat()
-                total += stat.st_size
-                entries.append((stat.st_mtime, stat.st_size, path))
-
-            if total <= max_bytes:
-                return
-
-            entries.sort(key=lambda item: item[0])
-            for _, size, path in entries:
-                try:
-                    path.unlink()
-                    total -= size
-                except OSError:
-                    continue
-                if total <= max_bytes:
-                    break
-        except OSError:
-            return
+    def _load_static(self) -> dict[str, tuple[bytes, str]]:
+        # The renderer bundle is small and fixed for the life of the server,
+        # so every page (one per render worker) is served from memory.
+        static: dict[str, tuple[bytes, str]] = {}
+        for file_path in self._renderer_dir.rglob("*"):
+            if not file_path.is_file():
+                continue
+            content_type = (
+                mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
+            )
+            rel_path = file_path.relative_to(self._renderer_dir).as_posix()
+            static[f"/{rel_path}"] = (file_path.read_bytes(), content_type)
+        return static
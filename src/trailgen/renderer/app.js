@@ -212,10 +212,10 @@
   };
 
 
-  window.__renderFrame = (camera) => {
+  window.__renderFrame = (camera, waitOverride) => {
     return new Promise((resolve) => {
       const timeoutMs = cfg.frameTimeoutMs ?? 15000;
-      const waitEvent = cfg.frameWait ?? "idle";
+      const waitEvent = waitOverride ?? cfg.frameWait ?? "idle";
       const delayMs = cfg.frameDelayMs ?? 0;
       let done = false;
       const finish = () => {
@@ -1,3 +1,3 @@
-from .sampler import TerrainSampler, select_dem_zoom
+from .sampler import TerrainSampler, select_dem_zoom, write_cache_file
 
-__all__ = ["TerrainSampler", "select_dem_zoom"]
+__all__ = ["TerrainSampler", "select_dem_zoom", "write_cache_file"]
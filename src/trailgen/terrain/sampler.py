@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import io
 import math
+import os
 import re
+import tempfile
+import threading
 import urllib.parse
 import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
 from PIL import Image
 
@@ -14,6 +20,10 @@ from trailgen.geo import EARTH_RADIUS_M
 
 
 _TILE_SIZE = 256
+_TILE_CACHE_SIZE = 64
+_PREFETCH_WORKERS = 8
+
+_TileKey = tuple[int, int, int]
 
 
 def _decode_height_mapbox(r: int, g: int, b: int) -> float:
@@ -50,6 +60,23 @@ def _tile_pixel(lon: float, lat: float, zoom: int) -> tuple[int, int, int, int]:
     return tile_x, tile_y, px, py
 
 
+def write_cache_file(path: Path, data: bytes) -> None:
+    # The sampler and the renderer's tile proxy share the tile cache and run
+    # at the same time, so write to a unique temp file next to the target and
+    # swap it in: readers never see a partly written tile.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def select_dem_zoom(lat: float, target_resolution_m: float = 30.0) -> int:
     meters_per_pixel = target_resolution_m
     value = (
@@ -71,19 +98,77 @@ class TerrainSampler:
     zoom: int
     exaggeration: float = 1.0
     timeout_s: float = 20.0
+    # Called with (path, size) after a tile is written to the cache, so a
+    # shared cache index can account for it.
+    on_cache_write: Callable[[Path, int], None] | None = None
+    # Once set, tiles missing from the disk cache are no longer fetched and
+    # read as holes, so a caller that gave up on the result isn't kept
+    # waiting on the network.
+    cancel: threading.Event | None = None
 
     def __post_init__(self) -> None:
         self._encoding = (self.encoding or "mapbox").lower()
         self._cache_dir = self.cache_dir
-        self._tile_cache: dict[tuple[int, int, int], Image.Image] = {}
+        # Tiles are kept as PixelAccess objects: indexing one is several times
+        # cheaper than Image.getpixel.
+        self._tile_cache: OrderedDict[_TileKey, Image.core.PixelAccess] = OrderedDict()
+        # Decoded heights per cached tile, keyed by pixel. Nearby queries
+        # (candidate cameras, overlapping sight lines) keep landing on the same
+        # DEM pixels; the memo lives and dies with its tile.
+        self._tile_heights: dict[_TileKey, dict[tuple[int, int], float]] = {}
         self._ext = self._infer_extension(self.url_template)
 
     def height_at(self, lon: float, lat: float) -> float | None:
-        tile_x, tile_y, px, py = _tile_pixel(lon, lat, self.zoom)
-        tile = self._load_tile(tile_x, tile_y)
-        if tile is None:
-            return None
-        r, g, b = tile.getpixel((px, py))
+        return self.height_at_many([lon], [lat])[0]
+
+    def height_at_many(
+        self, lons: list[float], lats: list[float]
+    ) -> list[float | None]:
+        heights: list[float | None] = []
+        tile_key = None
+        tile = None
+        memo: dict[tuple[int, int], float] = {}
+        for lon, lat in zip(lons, lats):
+            tile_x, tile_y, px, py = _tile_pixel(lon, lat, self.zoom)
+            if (tile_x, tile_y) != tile_key:
+                tile_key = (tile_x, tile_y)
+                tile = self._load_tile(tile_x, tile_y)
+                memo = self._tile_heights.get((self.zoom, tile_x, tile_y), {})
+            if tile is None:
+                heights.append(None)
+                continue
+            height = memo.get((px, py))
+            if height is None:
+                height = self._pixel_height(tile, px, py)
+                memo[(px, py)] = height
+            heights.append(height)
+        return heights
+
+    def prefetch(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float
+    ) -> None:
+        x0, y0 = _tile_xyz(min_lon, max_lat, self.zoom)
+        x1, y1 = _tile_xyz(max_lon, min_lat, self.zoom)
+        missing = [
+            (x, y)
+            for x in range(x0, x1 + 1)
+            for y in range(y0, y1 + 1)
+            if (self.zoom, x, y) not in self._tile_cache
+        ]
+        # A box wider than the in-memory cache would only evict its own tiles.
+        if not missing or len(missing) > _TILE_CACHE_SIZE or self._cancelled():
+            return
+        with ThreadPoolExecutor(max_workers=_PREFETCH_WORKERS) as pool:
+            payloads = list(pool.map(lambda key: self._read_tile(*key), missing))
+        for (x, y), data in zip(missing, payloads):
+            if data is not None:
+                self._decode_tile(x, y, data)
+
+    def _cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def _pixel_height(self, tile: Image.core.PixelAccess, px: int, py: int) -> float:
+        r, g, b = tile[px, py]
         if self._encoding == "terrarium":
             height = _decode_height_terrarium(r, g, b)
         else:
@@ -100,43 +185,68 @@ class TerrainSampler:
             return suffix.lstrip(".")
         return "png"
 
-    def _load_tile(self, x: int, y: int) -> Image.Image | None:
+    def _load_tile(self, x: int, y: int) -> Image.core.PixelAccess | None:
         key = (self.zoom, x, y)
         cached = self._tile_cache.get(key)
         if cached is not None:
+            self._tile_cache.move_to_end(key)
             return cached
 
-        cache_path = self._cache_dir / "terrain_rgb" / str(self.zoom) / str(x)
-        cache_path.mkdir(parents=True, exist_ok=True)
-        tile_path = cache_path / f"{y}.{self._ext}"
-        data = None
-        if tile_path.is_file():
-            try:
-                data = tile_path.read_bytes()
-            except OSError:
-                data = None
-
+        data = self._read_tile(x, y)
         if data is None:
-            url = self.url_template.format(z=self.zoom, x=x, y=y)
-            try:
-                req = urllib.request.Request(
-                    url, headers={"User-Agent": "trailgen/0.1"}
-                )
-                with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
-                    data = resp.read()
-                try:
-                    tile_path.write_bytes(data)
-                except OSError:
-                    pass
-            except Exception:
-                return None
+            return None
+        return self._decode_tile(x, y, data)
+
+    def _tile_path(self, x: int, y: int) -> Path:
+        # Same layout as the renderer's tile proxy, so DEM tiles fetched while
+        # planning the camera are cache hits when the browser asks for them.
+        return (
+            self._cache_dir / "terrain" / str(self.zoom) / str(x) / f"{y}.{self._ext}"
+        )
 
+    def _read_tile(self, x: int, y: int) -> bytes | None:
+        tile_path = self._tile_path(x, y)
         try:
-            tile = Image.open(io.BytesIO(data)).convert("RGB")
+            return tile_path.read_bytes()
+        except OSError:
+            pass
+        if self._cancelled():
+            return None
+
+        url = self.url_template.format(z=self.zoom, x=x, y=y)
+        try:
+            req = urllib.request.Request(url, headers={"User-Agent": "trailgen/0.1"})
+            with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+                data = resp.read()
+        except Exception:
+            return None
+        try:
+            write_cache_file(tile_path, data)
+        except OSError:
+            return data
+        if self.on_cache_write is not None:
+            self.on_cache_write(tile_path, len(data))
+        return data
+
+    def _decode_tile(
+        self, x: int, y: int, data: bytes
+    ) -> Image.core.PixelAccess | None:
+        try:
+            tile = Image.open(io.BytesIO(data)).convert("RGB").load()
         except Exception:
+            # Drop an undecodable cache entry so the next run fetches it again
+            # instead of treating it as a permanent hole in the DEM.
+            try:
+                self._tile_path(x, y).unlink(missing_ok=True)
+            except OSError:
+                pass
             return None
 
+        key = (self.zoom, x, y)
         self._tile_cache[key] = tile
-        if len(self._tile_cache) > 64:
-            self._tile_cache.pop(next(iter(self._tile_cache)))
+        self._tile_cache.move_to_end(key)
+        self._tile_heights[key] = {}
+        if len(self._tile_cache) > _TILE_CACHE_SIZE:
+            evicted, _ = self._tile_cache.popitem(last=False)
+            self._tile_heights.pop(evicted, None)
         return tile